@@ -1,13 +1,26 @@
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
+import functools
+import hashlib
 import re
+import shutil
+import subprocess
+import sys
+import threading
 import wave
-import struct
-import math
 import tempfile
 import os
+import numpy as np
 import pyttsx3
 
-@dataclass
+try:
+    from numba import njit
+except ImportError:  # numba is optional; the kernels then run as plain Python
+    def njit(*args, **kwargs):
+        return lambda func: func
+
+
+@dataclass(slots=True)
 class TestConfig:
     init_speed_in_km_per_hour: float
     init_speed_in_meters_per_sec: float
@@ -27,7 +40,7 @@ class TestConfig:
         self.init_speed_in_meters_per_sec = init_speed_in_km_per_hour / 3.6  # Convert km/h to m/s
 
 
-@dataclass
+@dataclass(slots=True)
 class IntervalParams:
     duration_in_sec: int
     distance_in_meters: int
@@ -78,15 +91,12 @@ def create_init_interval(config: TestConfig) -> IntervalParams:
 def create_next_interval(previous_interval: IntervalParams, config: TestConfig) -> IntervalParams:
     ival = IntervalParams()
 
-    if previous_interval.move_to_next_stage_at_end:
-        ival.speed_in_km_per_hour = previous_interval.speed_in_km_per_hour + config.stage_speed_increment
-    else:
-        ival.speed_in_km_per_hour = previous_interval.speed_in_km_per_hour
-    ival.speed_in_meters_per_sec = ival.speed_in_km_per_hour / 3.6  # <-- Added
+    ival.speed_in_km_per_hour = previous_interval.speed_in_km_per_hour + (
+        config.stage_speed_increment if previous_interval.move_to_next_stage_at_end else 0.0)
+    ival.speed_in_meters_per_sec = ival.speed_in_km_per_hour / 3.6
 
     ival.distance_in_meters = config.interval_distance_in_meters
     ival.duration_in_sec = duration_from_speed_and_distance(ival.speed_in_meters_per_sec, config.interval_distance_in_meters)
-    ival.distance_in_meters = config.interval_distance_in_meters
     ival.total_duration_at_start_in_sec = previous_interval.total_duration_at_end_in_sec
     ival.total_duration_at_end_in_sec = ival.total_duration_at_start_in_sec + ival.duration_in_sec
     ival.total_distance_at_start_in_meters = previous_interval.total_distance_at_end_in_meters
@@ -103,50 +113,78 @@ def move_to_next_stage(current_interval: IntervalParams, config: TestConfig) ->
     return stage_duration > config.stage_duration_in_sec or abs(stage_duration - config.stage_duration_in_sec) < config.stage_duration_threshold_in_sec
 
 
-def print_intervals_table(intervals, columns):
-    # Print header
-    header = ""
-    for _, title, fmt in columns:
-        # Extract width using regex, fallback to 12
-        m = re.search(r'<(\d+)', fmt)
-        width = int(m.group(1)) if m else 12
-        header += f"{title:<{width}}"
-    print(header)
-    # Print rows
-    for i, interval in enumerate(intervals):
-        row = ""
-        for attr, _, fmt in columns:
-            value = getattr(interval, attr) if attr != "index" else i
-            # Format floats with .2f if specified
-            if isinstance(value, float) and ".2f" in fmt:
-                row += f"{value:{fmt}}"
-            else:
-                row += f"{value!s:{fmt}}"
-        print(row)
-
-
-test_config = TestConfig(
-    init_speed_in_km_per_hour=8.0,
-    interval_distance_in_meters=50,
-    stage_duration_in_sec=60,
-    stage_duration_threshold_in_sec=9,
-    stage_speed_increment=.5,
-    max_speed=25.0
-)
-
-intervals = []
-
-
-next_interval = create_init_interval(test_config)
-intervals.append(next_interval)
-
-ival = 0
-while ival < 100 and next_interval.speed_in_km_per_hour <= test_config.max_speed:
-    next_interval = create_next_interval(intervals[-1], test_config)
-    intervals.append(next_interval)
-    ival += 1
-
-columns = [
+# Columns of the interval table filled by build_intervals
+COL_SPEED_KMH, COL_SPEED_MS, COL_DURATION, COL_TOTAL_DURATION, COL_TOTAL_DISTANCE, \
+    COL_STAGE_START, COL_STAGE_END, COL_MOVE = range(8)
+
+
+@njit(cache=True)
+def build_intervals(init_speed_ms, interval_dist, stage_dur, stage_thr, stage_inc, max_speed, out):
+    """Fill the (N, 8) float64 table `out` with intervals and return the number of rows used."""
+    speed_ms = init_speed_ms
+    speed_kmh = speed_ms * 3.6
+    duration = interval_dist / speed_ms
+    out[0, COL_SPEED_KMH] = speed_kmh
+    out[0, COL_SPEED_MS] = init_speed_ms
+    out[0, COL_DURATION] = duration
+    out[0, COL_TOTAL_DURATION] = duration
+    out[0, COL_TOTAL_DISTANCE] = interval_dist
+    out[0, COL_STAGE_START] = 0.0
+    out[0, COL_STAGE_END] = duration
+    out[0, COL_MOVE] = 0.0
+
+    n = 1
+    while n < out.shape[0] and speed_kmh <= max_speed:
+        moved = out[n - 1, COL_MOVE] != 0.0
+        if moved:
+            # Step in km/h like create_next_interval so stages land exactly on max_speed
+            speed_kmh = speed_kmh + stage_inc
+        speed_ms = speed_kmh / 3.6
+        duration = interval_dist / speed_ms
+        stage_start = 0.0 if moved else out[n - 1, COL_STAGE_END]
+        stage_end = stage_start + duration
+
+        out[n, COL_SPEED_KMH] = speed_kmh
+        out[n, COL_SPEED_MS] = speed_ms
+        out[n, COL_DURATION] = duration
+        out[n, COL_TOTAL_DURATION] = out[n - 1, COL_TOTAL_DURATION] + duration
+        out[n, COL_TOTAL_DISTANCE] = out[n - 1, COL_TOTAL_DISTANCE] + interval_dist
+        out[n, COL_STAGE_START] = stage_start
+        out[n, COL_STAGE_END] = stage_end
+        out[n, COL_MOVE] = 1.0 if stage_end > stage_dur or abs(stage_end - stage_dur) < stage_thr else 0.0
+        n += 1
+    return n
+
+
+def intervals_from_table(table, config: TestConfig) -> list:
+    """Wrap the rows of a build_intervals table into IntervalParams instances."""
+    intervals = []
+    total_duration = 0.0
+    total_distance = 0
+    for row in table:
+        ival = IntervalParams()
+        ival.speed_in_km_per_hour = float(row[COL_SPEED_KMH])
+        ival.speed_in_meters_per_sec = float(row[COL_SPEED_MS])
+        ival.duration_in_sec = float(row[COL_DURATION])
+        ival.distance_in_meters = config.interval_distance_in_meters
+        ival.total_duration_at_start_in_sec = total_duration
+        ival.total_duration_at_end_in_sec = total_duration = float(row[COL_TOTAL_DURATION])
+        ival.total_distance_at_start_in_meters = total_distance
+        ival.total_distance_at_end_in_meters = total_distance = int(row[COL_TOTAL_DISTANCE])
+        ival.duration_time_in_stage_at_start = float(row[COL_STAGE_START])
+        ival.duration_time_in_stage_at_end = float(row[COL_STAGE_END])
+        ival.move_to_next_stage_at_end = bool(row[COL_MOVE])
+        intervals.append(ival)
+    return intervals
+
+
+def _expand_column(attr, title, fmt):
+    """Attach the header width (fallback 12) and the .2f float flag to a column spec."""
+    m = re.search(r'<(\d+)', fmt)
+    return attr, title, fmt, int(m.group(1)) if m else 12, ".2f" in fmt
+
+
+COLUMNS = [_expand_column(*column) for column in [
     ("index", "Interval", "<10"),
     ("speed_in_km_per_hour", "Speed (km/h)", "<15.2f"),
     ("duration_in_sec", "Duration (s)", "<15.2f"),
@@ -156,57 +194,168 @@ columns = [
     ("speed_in_meters_per_sec", "Speed (m/s)", "<15.2f"),
     ("move_to_next_stage_at_end", "Speed Change?", "<15"),
     ("duration_time_in_stage_at_end", "Time In Stage (s)", "<18.2f"),
-]
+]]
+
 
-print_intervals_table(intervals, columns)
+def print_intervals_table(intervals, columns=COLUMNS):
+    lines = ["".join(f"{title:<{width}}" for _, title, _, width, _ in columns)]
+    for i, interval in enumerate(intervals):
+        cells = []
+        for attr, _, fmt, _, is_float in columns:
+            value = getattr(interval, attr) if attr != "index" else i
+            if is_float and isinstance(value, float):
+                cells.append(f"{value:{fmt}}")
+            else:
+                cells.append(f"{value!s:{fmt}}")
+        lines.append("".join(cells))
+    sys.stdout.write("\n".join(lines) + "\n")
 
 
 def generate_sine_wave(frequency, duration, sample_rate=44100, amplitude=0.3):
-    """Generate a sine wave as a list of samples."""
-    samples = []
+    """Generate a sine wave as an int16 array of samples."""
     num_samples = int(sample_rate * duration)
-    for i in range(num_samples):
-        t = i / sample_rate
-        sample = amplitude * math.sin(2 * math.pi * frequency * t)
-        samples.append(int(sample * 32767))  # Convert to 16-bit integer
+    phase_increment = 2 * np.pi * frequency / sample_rate
+    samples = np.sin(phase_increment * np.arange(num_samples))
+    samples *= amplitude * 32767.0
+    return samples.astype(np.int16)  # Convert to 16-bit integer
+
+
+def read_only(samples):
+    """Mark a sample buffer read-only so it can be shared between callers."""
+    samples.setflags(write=False)
     return samples
 
 
+@functools.lru_cache(maxsize=32)
 def generate_silence(duration, sample_rate=44100):
-    """Generate silence as a list of samples."""
-    return [0] * int(sample_rate * duration)
+    """Generate silence as a shared, read-only int16 array of samples."""
+    return read_only(np.zeros(int(sample_rate * duration), dtype=np.int16))
 
 
+@functools.lru_cache(maxsize=32)
 def generate_beep(frequency=800, duration=0.2, sample_rate=44100):
-    """Generate a single beep sound."""
-    return generate_sine_wave(frequency, duration, sample_rate)
+    """Generate a single beep sound as a shared, read-only array."""
+    return read_only(generate_sine_wave(frequency, duration, sample_rate))
 
 
+@functools.lru_cache(maxsize=32)
 def generate_triple_beep(frequency=800, beep_duration=0.2, pause_duration=0.1):
-    """Generate three beeps with pauses between them."""
+    """Generate three beeps with pauses between them as a shared, read-only array."""
     beep = generate_beep(frequency, beep_duration)
     pause = generate_silence(pause_duration)
-    return beep + pause + beep + pause + beep
+    return read_only(np.concatenate([beep, pause, beep, pause, beep]))
+
+
+ESPEAK_VOICE = "en+f3"  # Female variant, like the voice picked for pyttsx3
+CACHE_DIR = os.path.join(".cache", "mas")  # Kept apart from the src AudioCache entries
+
+_ENGINE = None
+_ENGINE_LOCK = threading.Lock()  # pyttsx3 engines are not thread-safe
+_voice_cache = {}
+
+
+def _pick_female_voice(engine):
+    """Select a female voice on the engine if one is available."""
+    for voice in engine.getProperty('voices'):
+        if 'female' in voice.name.lower() or 'zira' in voice.name.lower():
+            engine.setProperty('voice', voice.id)
+            break
+
+
+def _get_engine():
+    """Initialize the pyttsx3 engine once and reuse it for every announcement."""
+    global _ENGINE
+    if _ENGINE is None:
+        engine = pyttsx3.init()
+        engine.setProperty('rate', 175)    # Normal speech rate
+        engine.setProperty('volume', 0.9)  # Volume level (0.0 to 1.0)
+        _pick_female_voice(engine)
+        _ENGINE = engine
+    return _ENGINE
+
+
+def _voice_cache_file(text):
+    """Path of the on-disk cache entry for an announcement."""
+    return os.path.join(CACHE_DIR, f"tts_{hashlib.sha1(text.encode()).hexdigest()}.npy")
+
+
+def _store_voice(text, samples):
+    """Keep synthesized samples in memory and on disk."""
+    _voice_cache[text] = samples
+    cache_file = _voice_cache_file(text)
+    temp_file = f"{cache_file}.tmp"
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        # Write to a side file first so a killed run never leaves a partial entry
+        with open(temp_file, 'wb') as f:
+            np.save(f, samples)
+        os.replace(temp_file, cache_file)
+    except OSError as e:
+        print(f"Could not cache voice for {text!r}: {e}")
 
 
 def generate_voice_announcement(text, temp_dir):
-    """Generate voice announcement using pyttsx3."""
+    """Generate voice announcement, reusing cached audio for repeated text."""
+    if text in _voice_cache:
+        return _voice_cache[text]
+
+    cache_file = _voice_cache_file(text)
+    if os.path.exists(cache_file):
+        try:
+            samples = np.load(cache_file)
+        except (OSError, ValueError, EOFError) as e:
+            print(f"Ignoring unreadable cached voice for {text!r}: {e}")
+        else:
+            _voice_cache[text] = samples
+            return samples
+
+    samples = synthesize_voice_announcement(text, temp_dir)
+    if samples is None:
+        return generate_silence(2.0)
+    _store_voice(text, samples)
+    return samples
+
+
+def synthesize_with_espeak(text):
+    """Synthesize text with espeak-ng straight to memory, or return None if unavailable."""
+    espeak = shutil.which('espeak-ng')
+    if espeak is None:
+        return None
     try:
-        # Initialize the TTS engine
-        engine = pyttsx3.init()
+        # Same rate, volume and female voice as the pyttsx3 engine
+        command = [espeak, '--stdout', '-v', ESPEAK_VOICE, '-s', '175', '-a', '90', text]
+        result = subprocess.run(command, capture_output=True, check=True)
+    except (OSError, subprocess.CalledProcessError) as e:
+        print(f"espeak-ng error: {e}. Falling back to pyttsx3.")
+        return None
+
+    # espeak-ng writes a 44-byte RIFF header followed by mono 16-bit PCM
+    pcm = result.stdout
+    if len(pcm) <= 44:
+        return None
+    sample_rate = int.from_bytes(pcm[24:28], 'little')
+    samples = np.frombuffer(pcm[44:44 + (len(pcm) - 44) // 2 * 2], dtype='<i2')
+
+    if sample_rate != 44100:
+        samples = resample_audio(samples, sample_rate, 44100)
+    return samples
 
-        # Set properties for natural speech
-        engine.setProperty('rate', 150)    # Speed of speech
-        engine.setProperty('volume', 0.9)  # Volume level (0.0 to 1.0)
 
-        # Try to set a female voice if available
-        voices = engine.getProperty('voices')
-        for voice in voices:
-            if 'female' in voice.name.lower() or 'zira' in voice.name.lower():
-                engine.setProperty('voice', voice.id)
-                break
+def synthesize_voice_announcement(text, temp_dir):
+    """Synthesize voice announcement, or return None on failure."""
+    if os.name != 'nt':
+        samples = synthesize_with_espeak(text)
+        if samples is not None:
+            return samples
+
+    with _ENGINE_LOCK:
+        return synthesize_with_pyttsx3(text, temp_dir)
+
 
-        engine.setProperty('rate', 175)  # Normal speech rate
+def synthesize_with_pyttsx3(text, temp_dir):
+    """Synthesize text with pyttsx3 through a temporary WAV file, or return None on failure."""
+    try:
+        engine = _get_engine()
 
         # Create temporary file for TTS output
         import time
@@ -229,19 +378,14 @@ def generate_voice_announcement(text, temp_dir):
 
                     print(f"pyttsx3 audio: {sample_rate} Hz, {channels} channel(s)")
 
-                    # Convert to list of integers
+                    # Convert to an int16 array
+                    samples = np.frombuffer(frames, dtype='<i2')
                     if channels == 1:
-                        samples = list(struct.unpack('<' + 'h' * (len(frames) // 2), frames))
+                        samples = samples.copy()
                     else:
                         # Convert stereo to mono by averaging channels
-                        stereo_samples = list(struct.unpack('<' + 'h' * (len(frames) // 2), frames))
-                        samples = []
-                        for i in range(0, len(stereo_samples), 2):
-                            if i + 1 < len(stereo_samples):
-                                mono_sample = (stereo_samples[i] + stereo_samples[i + 1]) // 2
-                                samples.append(mono_sample)
-                            else:
-                                samples.append(stereo_samples[i])
+                        stereo_samples = samples.astype(np.int32)
+                        samples = ((stereo_samples[0::2] + stereo_samples[1::2]) >> 1).astype(np.int16)
 
                     # Resample to 44100 Hz if needed
                     if sample_rate != 44100:
@@ -258,36 +402,26 @@ def generate_voice_announcement(text, temp_dir):
                         pass
         else:
             print("TTS audio file was not created")
-            return generate_silence(2.0)
+            return None
 
     except Exception as e:
         print(f"pyttsx3 error: {e}. Using silence instead.")
-        return generate_silence(2.0)
+        return None
 
 
 def resample_audio(samples, original_rate, target_rate):
-    """Simple audio resampling."""
-    if original_rate == target_rate:
+    """Simple audio resampling using linear interpolation."""
+    if original_rate == target_rate or len(samples) == 0:
         return samples
 
+    samples = np.asarray(samples, dtype=np.float32)
     ratio = target_rate / original_rate
     new_length = int(len(samples) * ratio)
 
-    resampled = []
-    for i in range(new_length):
-        original_index = i / ratio
-        # Simple linear interpolation
-        index_floor = int(original_index)
-        index_ceil = min(index_floor + 1, len(samples) - 1)
-
-        if index_floor == index_ceil:
-            resampled.append(samples[index_floor])
-        else:
-            weight = original_index - index_floor
-            interpolated = int(samples[index_floor] * (1 - weight) + samples[index_ceil] * weight)
-            resampled.append(interpolated)
-
-    return resampled
+    # Linear interpolation; positions past the last sample hold its value
+    original_index = np.arange(new_length, dtype=np.float64) / ratio
+    resampled = np.interp(original_index, np.arange(len(samples)), samples)
+    return np.clip(resampled, -32768, 32767).astype(np.int16)
 
 
 def write_wav_file(samples, filename, sample_rate=44100):
@@ -297,19 +431,30 @@ def write_wav_file(samples, filename, sample_rate=44100):
         wav_file.setsampwidth(2)  # 16-bit
         wav_file.setframerate(sample_rate)
 
-        # Ensure all samples are within 16-bit range
-        clipped_samples = []
-        for sample in samples:
-            if sample > 32767:
-                clipped_samples.append(32767)
-            elif sample < -32768:
-                clipped_samples.append(-32768)
-            else:
-                clipped_samples.append(int(sample))
+        # Every generator produces int16 samples, so no clipping is needed
+        wav_file.writeframes(np.asarray(samples, dtype='<i2').tobytes())
+
+
+def speed_announcement(speed):
+    """Text announcing the upcoming speed."""
+    return f"Next speed... {speed:.1f}... kilometers per hour"
 
-        # Convert samples to bytes
-        frames = struct.pack('<' + 'h' * len(clipped_samples), *clipped_samples)
-        wav_file.writeframes(frames)
+
+def prefetch_voice_announcements(texts, temp_dir, max_workers=4):
+    """Synthesize the distinct texts and return their samples by text.
+
+    Only espeak-ng subprocesses run concurrently. pyttsx3 stays on the calling
+    thread because SAPI5 engines must be used on the thread that created them.
+    """
+    unique_texts = list(dict.fromkeys(texts))
+    if os.name != 'nt' and shutil.which('espeak-ng') is not None:
+        missing = [text for text in unique_texts
+                   if text not in _voice_cache and not os.path.exists(_voice_cache_file(text))]
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for text, samples in zip(missing, executor.map(synthesize_with_espeak, missing)):
+                if samples is not None:
+                    _store_voice(text, samples)
+    return {text: generate_voice_announcement(text, temp_dir) for text in unique_texts}
 
 
 def create_audio_timeline(intervals, output_filename="mas_audio.wav"):
@@ -317,67 +462,84 @@ def create_audio_timeline(intervals, output_filename="mas_audio.wav"):
     print("Generating audio timeline...")
 
     sample_rate = 44100
-    audio_samples = []
-
-    # Create a temporary directory for voice files
+    placements = []  # (start sample, samples) for every non-silent chunk
+    position = 0
+
+    def place(samples):
+        nonlocal position
+        placements.append((position, samples))
+        position += len(samples)
+
+    def skip_silence(duration):
+        nonlocal position
+        position += int(duration * sample_rate)
+
+    # First pass: synthesize every announcement the timeline may need in parallel
+    starting_announcement = "Starting test"
+    texts = [starting_announcement]
+    for i, interval in enumerate(intervals[:-1]):
+        if interval.move_to_next_stage_at_end:
+            texts.append(speed_announcement(intervals[i + 1].speed_in_km_per_hour))
     with tempfile.TemporaryDirectory() as temp_dir:
-        current_time = 0.0
-
-        # Add "starting test" announcement at the very beginning
-        print("Adding 'starting test' announcement at the beginning")
-        starting_announcement = "Starting test"
-        starting_voice_samples = generate_voice_announcement(starting_announcement, temp_dir)
-        audio_samples.extend(starting_voice_samples)
-        current_time += len(starting_voice_samples) / sample_rate
-
-        # Add a short pause after the starting announcement
-        pause_duration = 2.0  # 2 seconds pause
-        audio_samples.extend(generate_silence(pause_duration, sample_rate))
-        current_time += pause_duration
-
-        for i, interval in enumerate(intervals):
-            # Calculate the time until this interval ends (adjusted for starting announcement)
-            target_time = interval.total_duration_at_end_in_sec
-
-            # Check if we need a voice announcement 10 seconds before speed change
-            if interval.move_to_next_stage_at_end and i < len(intervals) - 1:
-                next_interval = intervals[i + 1]
-                voice_time = target_time - 10  # 10 seconds before
-
-                if voice_time > current_time and voice_time > 0:
-                    # Add silence until voice announcement time
-                    silence_duration = voice_time - current_time
-                    silence_samples = int(silence_duration * sample_rate)
-                    audio_samples.extend([0] * silence_samples)
-                    current_time = voice_time
-
-                    # Add voice announcement
-                    speed_value = next_interval.speed_in_km_per_hour
-                    announcement_text = f"Next speed... {speed_value:.1f}... kilometers per hour"
-                    print(f"Adding voice announcement at {voice_time:.1f}s: {announcement_text}")
-                    voice_samples = generate_voice_announcement(announcement_text, temp_dir)
-                    audio_samples.extend(voice_samples)
-                    current_time += len(voice_samples) / sample_rate
-
-            # Add silence until the interval end time
-            if target_time > current_time:
-                silence_duration = target_time - current_time
-                silence_samples = int(silence_duration * sample_rate)
-                audio_samples.extend([0] * silence_samples)
-                current_time = target_time
-
-            # Add beep(s) at interval end
-            if interval.move_to_next_stage_at_end:
-                # Triple beep for speed change
-                beep_samples = generate_triple_beep()
-                print(f"Adding triple beep at {interval.total_duration_at_end_in_sec:.1f}s (speed change)")
-            else:
-                # Single beep for normal interval
-                beep_samples = generate_beep()
-                print(f"Adding single beep at {interval.total_duration_at_end_in_sec:.1f}s")
+        voices = prefetch_voice_announcements(texts, temp_dir)
 
-            audio_samples.extend(beep_samples)
-            current_time += len(beep_samples) / sample_rate
+    # Second pass: lay out every chunk and compute the total length
+    current_time = 0.0
+
+    # Add "starting test" announcement at the very beginning
+    print("Adding 'starting test' announcement at the beginning")
+    starting_voice_samples = voices[starting_announcement]
+    place(starting_voice_samples)
+    current_time += len(starting_voice_samples) / sample_rate
+
+    # Add a short pause after the starting announcement
+    pause_duration = 2.0  # 2 seconds pause
+    skip_silence(pause_duration)
+    current_time += pause_duration
+
+    for i, interval in enumerate(intervals):
+        # Calculate the time until this interval ends (adjusted for starting announcement)
+        target_time = interval.total_duration_at_end_in_sec
+
+        # Check if we need a voice announcement 10 seconds before speed change
+        if interval.move_to_next_stage_at_end and i < len(intervals) - 1:
+            next_interval = intervals[i + 1]
+            voice_time = target_time - 10  # 10 seconds before
+
+            if voice_time > current_time and voice_time > 0:
+                # Add silence until voice announcement time
+                skip_silence(voice_time - current_time)
+                current_time = voice_time
+
+                # Add voice announcement
+                announcement_text = speed_announcement(next_interval.speed_in_km_per_hour)
+                print(f"Adding voice announcement at {voice_time:.1f}s: {announcement_text}")
+                voice_samples = voices[announcement_text]
+                place(voice_samples)
+                current_time += len(voice_samples) / sample_rate
+
+        # Add silence until the interval end time
+        if target_time > current_time:
+            skip_silence(target_time - current_time)
+            current_time = target_time
+
+        # Add beep(s) at interval end
+        if interval.move_to_next_stage_at_end:
+            # Triple beep for speed change
+            beep_samples = generate_triple_beep()
+            print(f"Adding triple beep at {interval.total_duration_at_end_in_sec:.1f}s (speed change)")
+        else:
+            # Single beep for normal interval
+            beep_samples = generate_beep()
+            print(f"Adding single beep at {interval.total_duration_at_end_in_sec:.1f}s")
+
+        place(beep_samples)
+        current_time += len(beep_samples) / sample_rate
+
+    # Third pass: splice the chunks into a buffer allocated once; gaps stay silent
+    audio_samples = np.zeros(position, dtype=np.int16)
+    for start, samples in placements:
+        audio_samples[start:start + len(samples)] = samples
 
     # Write the final audio file
     print(f"Exporting audio to {output_filename}...")
@@ -388,7 +550,29 @@ def create_audio_timeline(intervals, output_filename="mas_audio.wav"):
     return output_filename
 
 
-# Generate the audio file
 if __name__ == "__main__":
+    test_config = TestConfig(
+        init_speed_in_km_per_hour=8.0,
+        interval_distance_in_meters=50,
+        stage_duration_in_sec=60,
+        stage_duration_threshold_in_sec=9,
+        stage_speed_increment=.5,
+        max_speed=25.0
+    )
+
+    interval_table = np.zeros((101, 8), dtype=np.float64)
+    interval_count = build_intervals(
+        test_config.init_speed_in_meters_per_sec,
+        test_config.interval_distance_in_meters,
+        test_config.stage_duration_in_sec,
+        test_config.stage_duration_threshold_in_sec,
+        test_config.stage_speed_increment,
+        test_config.max_speed,
+        interval_table,
+    )
+    intervals = intervals_from_table(interval_table[:interval_count], test_config)
+
+    print_intervals_table(intervals)
+
+    # Generate the audio file
     create_audio_timeline(intervals, "mas_training_audio.wav")
-
@@ -36,10 +36,23 @@ def setup_logging(verbose: bool = False) -> None:
 
 
 
-def parse_arguments():
-    """Parse command line arguments."""
+def build_arg_parser(
+    description: str = 'Generate MAS (Maximum Aerobic Speed) training audio',
+    output_options: bool = True
+) -> argparse.ArgumentParser:
+    """
+    Build the command line parser shared by the application scripts.
+
+    Args:
+        description: Description shown in --help
+        output_options: Whether to offer --output and turning the cache
+            on or off, which only make sense when writing an audio file
+
+    Returns:
+        Parser for the training, cache, output and logging options
+    """
     parser = argparse.ArgumentParser(
-        description='Generate MAS (Maximum Aerobic Speed) training audio',
+        description=description,
         formatter_class=argparse.ArgumentDefaultsHelpFormatter
     )
 
@@ -82,18 +95,19 @@ def parse_arguments():
     )
 
     # Cache parameters
-    parser.add_argument(
-        '--enable-cache',
-        action='store_true',
-        default=True,
-        help='Enable audio sample caching'
-    )
-    parser.add_argument(
-        '--no-cache',
-        action='store_false',
-        dest='enable_cache',
-        help='Disable audio sample caching'
-    )
+    if output_options:
+        parser.add_argument(
+            '--enable-cache',
+            action='store_true',
+            default=True,
+            help='Enable audio sample caching'
+        )
+        parser.add_argument(
+            '--no-cache',
+            action='store_false',
+            dest='enable_cache',
+            help='Disable audio sample caching'
+        )
     parser.add_argument(
         '--cache-dir',
         type=str,
@@ -102,13 +116,14 @@ def parse_arguments():
     )
 
     # Output file
-    parser.add_argument(
-        '--output',
-        '-o',
-        type=str,
-        default='mas_training_audio.wav',
-        help='Output audio file name'
-    )
+    if output_options:
+        parser.add_argument(
+            '--output',
+            '-o',
+            type=str,
+            default='mas_training_audio.wav',
+            help='Output audio file name'
+        )
 
     # Logging
     parser.add_argument(
@@ -118,7 +133,12 @@ def parse_arguments():
         help='Enable verbose logging (DEBUG level)'
     )
 
-    return parser.parse_args()
+    return parser
+
+
+def parse_arguments():
+    """Parse command line arguments."""
+    return build_arg_parser().parse_args()
 
 
 def main():
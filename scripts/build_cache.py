@@ -0,0 +1,70 @@
+"""
+Pre-populate the audio cache for MAS Training Audio Generator.
+
+Synthesizes the countdown, the starting announcement, every speed
+announcement the given configuration can produce and the beeps, so a
+later run of mas_main.py never has to start the TTS engine.
+"""
+
+import logging
+import sys
+import tempfile
+from pathlib import Path
+
+# Add src directory to path, then the repository root ahead of it so
+# mas_main resolves to the command line entry point, not src/mas_main.py
+ROOT_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT_DIR / 'src'))
+sys.path.insert(0, str(ROOT_DIR))
+
+from audio import (  # noqa: E402
+    announcement_texts,
+    generate_beep,
+    generate_triple_beep,
+    prefetch_voice_announcements,
+)
+from audio_cache import AudioCache  # noqa: E402
+from config import TestConfig  # noqa: E402
+from intervals import generate_intervals  # noqa: E402
+from mas_main import build_arg_parser, setup_logging  # noqa: E402
+
+
+def parse_arguments():
+    """Parse command line arguments, shared with mas_main.py."""
+    parser = build_arg_parser(
+        description='Pre-populate the MAS training audio cache',
+        output_options=False
+    )
+    return parser.parse_args()
+
+
+def main():
+    """Synthesize every cacheable sample for the configured test."""
+    args = parse_arguments()
+    setup_logging(verbose=args.verbose)
+    logger = logging.getLogger(__name__)
+
+    config = TestConfig(
+        init_speed_in_km_per_hour=args.init_speed,
+        interval_distance_in_meters=args.interval_distance,
+        stage_duration_in_sec=args.stage_duration,
+        stage_duration_threshold_in_sec=args.stage_threshold,
+        stage_speed_increment=args.speed_increment,
+        max_speed=args.max_speed,
+        enable_cache=True,
+        cache_dir=args.cache_dir
+    )
+    cache = AudioCache.shared(config.cache_dir)
+
+    generate_beep(cache=cache)
+    generate_triple_beep(cache=cache)
+
+    texts = announcement_texts(generate_intervals(config))
+    with tempfile.TemporaryDirectory() as temp_dir:
+        prefetch_voice_announcements(texts, temp_dir, cache)
+
+    logger.info(f"Cache now holds {cache.size()} items in {config.cache_dir}")
+
+
+if __name__ == "__main__":
+    main()
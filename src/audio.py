@@ -3,16 +3,21 @@ Audio generation module for MAS Training Audio Generator.
 Handles voice synthesis, beep generation, and WAV file creation.
 """
 
+import functools
 import logging
-import math
 import os
+import platform
 import random
-import struct
+import shutil
+import subprocess
 import tempfile
+import threading
 import time
 import wave
-from typing import List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
 
+import numpy as np
 import pyttsx3
 
 from audio_cache import AudioCache
@@ -27,7 +32,7 @@ def generate_sine_wave(
     duration: float,
     frequency: float,
     sample_rate: int = AudioConstants.SAMPLE_RATE
-) -> List[int]:
+) -> np.ndarray:
     """
     Generate a warm tone with harmonics and envelope for a pleasant sound.
 
@@ -37,44 +42,39 @@ def generate_sine_wave(
         sample_rate: Sample rate in Hz
 
     Returns:
-        List of audio samples
+        Array of int16 audio samples
     """
-    samples = []
     num_samples = int(duration * sample_rate)
     attack_samples = int(0.02 * sample_rate)  # 20ms attack
     release_samples = int(0.05 * sample_rate)  # 50ms release
 
-    for i in range(num_samples):
-        t = i / sample_rate
-
-        # Create warm tone with fundamental and harmonics
-        # Fundamental (full amplitude)
-        tone = math.sin(2 * math.pi * frequency * t)
-        # Second harmonic (reduced) for warmth
-        tone += 0.3 * math.sin(2 * math.pi * frequency * 2 * t)
-        # Third harmonic (reduced) for richness
-        tone += 0.15 * math.sin(2 * math.pi * frequency * 3 * t)
-        # Fifth harmonic (subtle) for bell-like quality
-        tone += 0.08 * math.sin(2 * math.pi * frequency * 5 * t)
-
-        # Apply envelope (attack-sustain-release)
-        envelope = 1.0
-        if i < attack_samples:
-            # Smooth attack
-            envelope = i / attack_samples
-        elif i > num_samples - release_samples:
-            # Smooth release
-            envelope = (num_samples - i) / release_samples
-
-        sample = int(AudioConstants.BEEP_AMPLITUDE * tone * envelope)
-        samples.append(sample)
-    return samples
+    idx = np.arange(num_samples)
+    # Phase of the fundamental, advancing by a fixed increment per sample
+    phase = idx * (2 * np.pi * frequency / sample_rate)
+
+    # Create warm tone with fundamental and harmonics
+    # Fundamental (full amplitude)
+    tone = np.sin(phase)
+    # Second harmonic (reduced) for warmth
+    tone += 0.3 * np.sin(2 * phase)
+    # Third harmonic (reduced) for richness
+    tone += 0.15 * np.sin(3 * phase)
+    # Fifth harmonic (subtle) for bell-like quality
+    tone += 0.08 * np.sin(5 * phase)
+
+    # Apply envelope (attack-sustain-release): the lower of the attack and
+    # release ramps, capped at full level for the sustain
+    attack = idx / attack_samples
+    release = (num_samples - idx) / release_samples
+    envelope = np.minimum(np.minimum(attack, release), 1.0)
+
+    return (AudioConstants.BEEP_AMPLITUDE * tone * envelope).astype(np.int16)
 
 
 def generate_silence(
     duration: float,
     sample_rate: int = AudioConstants.SAMPLE_RATE
-) -> List[int]:
+) -> np.ndarray:
     """
     Generate silence for specified duration.
 
@@ -83,16 +83,24 @@ def generate_silence(
         sample_rate: Sample rate in Hz
 
     Returns:
-        List of zero samples
+        Shared read-only array of zero int16 samples
     """
-    return [0] * int(duration * sample_rate)
+    return _silence(int(duration * sample_rate))
+
+
+@functools.lru_cache(maxsize=32)
+def _silence(num_samples: int) -> np.ndarray:
+    """Build a read-only block of silence, shared per length."""
+    samples = np.zeros(num_samples, dtype=np.int16)
+    samples.setflags(write=False)
+    return samples
 
 
 def generate_beep(
     duration: float = AudioConstants.BEEP_DURATION,
     frequency: float = AudioConstants.BEEP_FREQUENCY,
     cache: Optional[AudioCache] = None
-) -> List[int]:
+) -> np.ndarray:
     """
     Generate a single beep with optional caching.
 
@@ -102,7 +110,7 @@ def generate_beep(
         cache: Optional AudioCache instance for caching
 
     Returns:
-        List of audio samples
+        Array of int16 audio samples
     """
     cache_key = AudioCache.generate_key("beep", duration, frequency)
 
@@ -110,56 +118,305 @@ def generate_beep(
         cached = cache.get(cache_key)
         if cached is not None:
             logger.debug(f"Using cached beep: {duration}s @ {frequency}Hz")
-            return cached.copy()
+            return cached
 
     logger.debug(f"Generating beep: {duration}s @ {frequency}Hz")
     samples = generate_sine_wave(duration, frequency)
 
     if cache:
-        cache.set(cache_key, samples.copy())
+        cache.set(cache_key, samples)
 
     return samples
 
 
-def generate_triple_beep(cache: Optional[AudioCache] = None) -> List[int]:
+def generate_triple_beep(
+    cache: Optional[AudioCache] = None,
+    duration: float = AudioConstants.TRIPLE_BEEP_DURATION,
+    frequency: float = AudioConstants.BEEP_FREQUENCY,
+    pause_duration: float = AudioConstants.TRIPLE_BEEP_PAUSE
+) -> np.ndarray:
     """
     Generate a triple beep sequence for speed changes with optional caching.
 
     Args:
         cache: Optional AudioCache instance for caching
+        duration: Duration of each beep in seconds
+        frequency: Beep frequency in Hz
+        pause_duration: Pause between beeps in seconds
 
     Returns:
-        List of audio samples
+        Array of int16 audio samples
     """
-    cache_key = AudioCache.generate_key("triple_beep")
+    cache_key = AudioCache.generate_key(
+        "triple_beep", duration, frequency, pause_duration
+    )
 
     if cache:
         cached = cache.get(cache_key)
         if cached is not None:
             logger.debug("Using cached triple beep")
-            return cached.copy()
+            return cached
 
     logger.debug("Generating triple beep")
-    beep = generate_sine_wave(
-        AudioConstants.TRIPLE_BEEP_DURATION,
-        AudioConstants.BEEP_FREQUENCY
-    )
-    pause = generate_silence(AudioConstants.TRIPLE_BEEP_PAUSE)
-    samples = beep + pause + beep + pause + beep
+    beep = generate_sine_wave(duration, frequency)
+    beep_len = len(beep)
+    pause_len = int(pause_duration * AudioConstants.SAMPLE_RATE)
+
+    # Write the three beeps straight into one buffer; the pauses stay zero
+    samples = np.zeros(3 * beep_len + 2 * pause_len, dtype=np.int16)
+    for i in range(3):
+        start = i * (beep_len + pause_len)
+        samples[start:start + beep_len] = beep
 
     if cache:
-        cache.set(cache_key, samples.copy())
+        cache.set(cache_key, samples)
 
     return samples
 
 
+def speed_announcement_text(speed_in_km_per_hour: float) -> str:
+    """
+    Build the announcement spoken before a speed change.
+
+    Args:
+        speed_in_km_per_hour: Speed of the upcoming stage in km/h
+
+    Returns:
+        Text to speak
+    """
+    return f"Next speed... {speed_in_km_per_hour:.1f}... kilometers per hour"
+
+
+def announcement_texts(intervals: List) -> List[str]:
+    """
+    List every phrase the timeline may speak for the given intervals.
+
+    Args:
+        intervals: List of interval parameters
+
+    Returns:
+        Unique announcement texts in the order they are spoken
+    """
+    texts = [AudioConstants.STARTING_ANNOUNCEMENT]
+    texts.extend(str(number) for number in AudioConstants.COUNTDOWN_NUMBERS)
+    for interval, next_interval in zip(intervals, intervals[1:]):
+        if interval.move_to_next_stage_at_end:
+            texts.append(
+                speed_announcement_text(next_interval.speed_in_km_per_hour)
+            )
+    return list(dict.fromkeys(texts))
+
+
+_ENGINE: Optional[pyttsx3.Engine] = None
+_ENGINE_ERROR: Optional[Exception] = None  # Why initialization failed, if it did
+_ENGINE_LOCK = threading.Lock()  # pyttsx3 engines are not thread-safe
+
+
+def _select_female_voice(engine: pyttsx3.Engine) -> None:
+    """
+    Try to set a female voice on the engine if one is available.
+
+    Args:
+        engine: Initialized pyttsx3 engine
+    """
+    voices = engine.getProperty('voices')
+    if platform.system() == 'Windows':
+        for voice in voices:
+            if 'female' in voice.name.lower() or 'zira' in voice.name.lower():
+                engine.setProperty('voice', voice.id)
+                return
+    else:
+        # On Linux (eSpeak), female voices often have 'f' in their id or name
+        # Also check for mbrola voices like 'mb-us1', 'us-mbrola-1' (can be female)
+        for voice in voices:
+            if ('female' in voice.name.lower() or
+                'mb-us1' in voice.id.lower() or
+                'mb-us1' in voice.name.lower() or
+                'us-mbrola-1' in voice.id.lower() or
+                'us-mbrola-1' in voice.name.lower()):
+                engine.setProperty('voice', voice.id)
+                logger.info(f"Selected female/mbrola voice: {voice.id}")
+                return
+    logger.info("Available voices:")
+    for voice in voices:
+        logger.info(f"Voice: {voice.id} - {voice.name}")
+    logger.info("No female voice found; using default voice.")
+
+
+def _get_engine() -> pyttsx3.Engine:
+    """
+    Initialize the TTS engine once and reuse it for every announcement.
+
+    Callers must hold _ENGINE_LOCK. A failed initialization is remembered
+    for the rest of the process on purpose: a missing TTS driver does not
+    appear mid-run, and probing it again would cost a failed init per
+    announcement only to fall back to silence anyway.
+
+    Returns:
+        Shared pyttsx3 engine
+
+    Raises:
+        TTSError: If the engine could not be initialized
+    """
+    global _ENGINE, _ENGINE_ERROR
+    if _ENGINE is None:
+        if _ENGINE_ERROR is not None:
+            raise TTSError(f"TTS engine unavailable: {_ENGINE_ERROR}")
+        try:
+            if platform.system() == 'Windows':
+                engine = pyttsx3.init()
+            else:
+                # Force eSpeak on Linux
+                engine = pyttsx3.init(driverName='espeak')
+            _select_female_voice(engine)
+        except Exception as e:
+            _ENGINE_ERROR = e
+            logger.warning(
+                f"TTS engine unavailable, announcements will be silent: {e}"
+            )
+            raise TTSError(f"TTS engine unavailable: {e}") from e
+        _ENGINE = engine
+    return _ENGINE
+
+
+def _decode_pcm(frames: bytes, sample_rate: int, channels: int) -> np.ndarray:
+    """
+    Decode 16-bit PCM frames to mono samples at the output sample rate.
+
+    Args:
+        frames: Little-endian 16-bit PCM frames
+        sample_rate: Sample rate of the frames in Hz
+        channels: Number of interleaved channels
+
+    Returns:
+        Array of int16 audio samples
+    """
+    # Decode little-endian 16-bit frames without copying
+    samples = np.frombuffer(frames, dtype='<i2').astype(np.int16, copy=False)
+    if channels != 1:
+        # Convert to mono by averaging the channels of each frame
+        per_frame = samples.reshape(-1, channels).astype(np.int32)
+        samples = (per_frame.sum(axis=1) // channels).astype(np.int16)
+
+    # Resample to 44100 Hz if needed
+    if sample_rate != AudioConstants.SAMPLE_RATE:
+        samples = resample_audio(samples, sample_rate, AudioConstants.SAMPLE_RATE)
+        logger.debug(
+            f"Resampled from {sample_rate} Hz to "
+            f"{AudioConstants.SAMPLE_RATE} Hz"
+        )
+    return samples
+
+
+def synthesize_with_espeak(text: str) -> Optional[np.ndarray]:
+    """
+    Synthesize speech with the espeak-ng command straight to memory.
+
+    Speaks with the female AudioConstants.ESPEAK_VOICE variant, matching
+    what _select_female_voice picks on the pyttsx3 path.
+
+    Args:
+        text: Text to speak
+
+    Returns:
+        Array of int16 audio samples, or None if espeak-ng is unavailable
+    """
+    espeak = shutil.which('espeak-ng')
+    if espeak is None:
+        return None
+
+    command = [
+        espeak, '--stdout',
+        '-v', AudioConstants.ESPEAK_VOICE,
+        '-s', str(AudioConstants.TTS_RATE),
+        '-a', str(int(AudioConstants.TTS_VOLUME * 100)),
+        text
+    ]
+    try:
+        result = subprocess.run(command, capture_output=True, check=True)
+    except (OSError, subprocess.CalledProcessError) as e:
+        logger.warning(f"espeak-ng error: {e}. Falling back to pyttsx3.")
+        return None
+
+    # espeak-ng writes a 44-byte RIFF header followed by 16-bit PCM; the
+    # size fields are not filled in when streaming, so parse it directly
+    pcm = result.stdout
+    if len(pcm) <= AudioConstants.WAV_HEADER_SIZE or pcm[:4] != b'RIFF':
+        logger.warning("espeak-ng produced no audio. Falling back to pyttsx3.")
+        return None
+    channels = int.from_bytes(pcm[22:24], 'little')
+    sample_rate = int.from_bytes(pcm[24:28], 'little')
+    frame_bytes = 2 * channels
+    data = pcm[AudioConstants.WAV_HEADER_SIZE:]
+    data = data[:len(data) // frame_bytes * frame_bytes]
+
+    logger.debug(f"espeak-ng audio: {sample_rate} Hz, {channels} channel(s)")
+    return _decode_pcm(data, sample_rate, channels)
+
+
+def synthesize_with_pyttsx3(text: str, temp_dir: str) -> Optional[np.ndarray]:
+    """
+    Synthesize speech with pyttsx3 through a temporary WAV file.
+
+    Args:
+        text: Text to speak
+        temp_dir: Temporary directory for intermediate files
+
+    Returns:
+        Array of int16 audio samples, or None if no audio was produced
+
+    Raises:
+        TTSError: If the TTS engine is unavailable
+    """
+    # Create temporary file for TTS output
+    timestamp = str(int(time.time() * 1000))
+    random_suffix = str(random.randint(1000, 9999))
+    temp_wav = os.path.join(
+        temp_dir,
+        f"temp_voice_{timestamp}_{threading.get_ident()}_{random_suffix}.wav"
+    )
+
+    # Save speech to file
+    with _ENGINE_LOCK:
+        engine = _get_engine()
+        # Reapply properties in case a previous run changed them
+        engine.setProperty('rate', AudioConstants.TTS_RATE)
+        engine.setProperty('volume', AudioConstants.TTS_VOLUME)
+        engine.save_to_file(text, temp_wav)
+        engine.runAndWait()
+
+    # Read the generated WAV file
+    if not os.path.exists(temp_wav):
+        logger.error("TTS audio file was not created")
+        return None
+
+    try:
+        with wave.open(temp_wav, 'rb') as wav_file:
+            frames = wav_file.readframes(wav_file.getnframes())
+            sample_rate = wav_file.getframerate()
+            channels = wav_file.getnchannels()
+    finally:
+        # Clean up temp file
+        try:
+            os.remove(temp_wav)
+        except OSError:
+            pass
+
+    logger.debug(f"pyttsx3 audio: {sample_rate} Hz, {channels} channel(s)")
+    return _decode_pcm(frames, sample_rate, channels)
+
+
 def generate_voice_announcement(
     text: str,
     temp_dir: str,
     cache: Optional[AudioCache] = None
-) -> List[int]:
+) -> np.ndarray:
     """
-    Generate voice announcement using pyttsx3 with optional caching.
+    Generate voice announcement with optional caching.
+
+    Outside Windows the espeak-ng command is used when it is installed,
+    which hands the audio back in memory; otherwise pyttsx3 renders it
+    through a temporary file.
 
     Args:
         text: Text to speak
@@ -167,10 +424,7 @@ def generate_voice_announcement(
         cache: Optional AudioCache instance for caching
 
     Returns:
-        List of audio samples
-
-    Raises:
-        TTSError: If TTS fails completely
+        Array of int16 audio samples; silence if synthesis fails
     """
     cache_key = AudioCache.generate_key("voice", text)
 
@@ -178,134 +432,128 @@ def generate_voice_announcement(
         cached = cache.get(cache_key)
         if cached is not None:
             logger.info(f"Using cached voice: {text}")
-            return cached.copy()
+            return cached
 
     logger.info(f"Generating voice: {text}")
 
     try:
-        # Initialize the TTS engine
-        import platform
-        if platform.system() == 'Windows':
-            engine = pyttsx3.init()
-        else:
-            # Force eSpeak on Linux
-            engine = pyttsx3.init(driverName='espeak')
+        samples = None
+        if platform.system() != 'Windows':
+            samples = synthesize_with_espeak(text)
+        if samples is None:
+            samples = synthesize_with_pyttsx3(text, temp_dir)
+    except Exception as e:
+        logger.error(f"TTS error: {e}. Using silence instead.")
+        return generate_silence(AudioConstants.SILENCE_FALLBACK)
 
-        # Set properties for natural speech
-        engine.setProperty('rate', AudioConstants.TTS_RATE)
-        engine.setProperty('volume', AudioConstants.TTS_VOLUME)
+    if samples is None:
+        return generate_silence(AudioConstants.SILENCE_FALLBACK)
 
-        # Try to set a female voice if available
-        import platform
-        voices = engine.getProperty('voices')
-        female_voice_found = False
-        if platform.system() == 'Windows':
-            for voice in voices:
-                if 'female' in voice.name.lower() or 'zira' in voice.name.lower():
-                    engine.setProperty('voice', voice.id)
-                    female_voice_found = True
-                    break
-        else:
-            # On Linux (eSpeak), female voices often have 'f' in their id or name
-            # Also check for mbrola voices like 'mb-us1', 'us-mbrola-1' (can be female)
-            for voice in voices:
-                if ('female' in voice.name.lower() or
-                    'mb-us1' in voice.id.lower() or
-                    'mb-us1' in voice.name.lower() or
-                    'us-mbrola-1' in voice.id.lower() or
-                    'us-mbrola-1' in voice.name.lower()):
-                    engine.setProperty('voice', voice.id)
-                    female_voice_found = True
-                    logger.info(f"Selected female/mbrola voice: {voice.id}")
-                    break
-        if not female_voice_found:
-            logger.info("Available voices:")
-            for voice in voices:
-                logger.info(f"Voice: {voice.id} - {voice.name}")
-            logger.info("No female voice found; using default voice.")
-
-        # Create temporary file for TTS output
-        timestamp = str(int(time.time() * 1000))
-        random_suffix = str(random.randint(1000, 9999))
-        temp_wav = os.path.join(
-            temp_dir,
-            f"temp_voice_{timestamp}_{random_suffix}.wav"
-        )
+    # Cache the result
+    if cache:
+        cache.set(cache_key, samples)
 
-        # Save speech to file
-        engine.save_to_file(text, temp_wav)
-        engine.runAndWait()
+    return samples
 
-        # Read the generated WAV file
-        if not os.path.exists(temp_wav):
-            logger.error("TTS audio file was not created")
-            return generate_silence(AudioConstants.SILENCE_FALLBACK)
 
-        try:
-            with wave.open(temp_wav, 'rb') as wav_file:
-                frames = wav_file.readframes(wav_file.getnframes())
-                sample_rate = wav_file.getframerate()
-                channels = wav_file.getnchannels()
-
-                logger.debug(
-                    f"pyttsx3 audio: {sample_rate} Hz, "
-                    f"{channels} channel(s)"
-                )
+def prefetch_voice_announcements(
+    texts: List[str],
+    temp_dir: str,
+    cache: Optional[AudioCache] = None,
+    max_workers: int = 8
+) -> Dict[str, np.ndarray]:
+    """
+    Generate the distinct announcements, running espeak-ng concurrently.
+
+    Only the espeak-ng subprocesses run in worker threads. Anything left
+    goes through generate_voice_announcement on the calling thread, since
+    pyttsx3 engines (SAPI5 in particular) must be used on the thread that
+    initialized them.
+
+    Args:
+        texts: Texts to speak (duplicates are generated once)
+        temp_dir: Temporary directory for intermediate files
+        cache: Optional AudioCache instance for caching
+        max_workers: Maximum number of espeak-ng processes at once
 
-                # Convert to list of integers
-                if channels == 1:
-                    fmt = '<' + 'h' * (len(frames) // 2)
-                    samples = list(struct.unpack(fmt, frames))
-                else:
-                    # Convert stereo to mono by averaging channels
-                    fmt = '<' + 'h' * (len(frames) // 2)
-                    stereo_samples = list(struct.unpack(fmt, frames))
-                    samples = []
-                    for i in range(0, len(stereo_samples), 2):
-                        if i + 1 < len(stereo_samples):
-                            mono_sample = (
-                                stereo_samples[i] +
-                                stereo_samples[i + 1]
-                            ) // 2
-                            samples.append(mono_sample)
-                        else:
-                            samples.append(stereo_samples[i])
-
-                # Resample to 44100 Hz if needed
-                if sample_rate != AudioConstants.SAMPLE_RATE:
-                    samples = resample_audio(
-                        samples,
-                        sample_rate,
-                        AudioConstants.SAMPLE_RATE
-                    )
-                    logger.debug(
-                        f"Resampled from {sample_rate} Hz to "
-                        f"{AudioConstants.SAMPLE_RATE} Hz"
-                    )
-
-                # Cache the result
+    Returns:
+        Mapping from text to its audio samples
+    """
+    unique_texts = list(dict.fromkeys(texts))
+    voices: Dict[str, np.ndarray] = {}
+    pending = []
+    for text in unique_texts:
+        cached = (
+            cache.get(AudioCache.generate_key("voice", text)) if cache else None
+        )
+        if cached is not None:
+            logger.info(f"Using cached voice: {text}")
+            voices[text] = cached
+        else:
+            pending.append(text)
+
+    if (pending and platform.system() != 'Windows'
+            and shutil.which('espeak-ng') is not None):
+        workers = min(max_workers, len(pending))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = executor.map(synthesize_with_espeak, pending)
+            for text, samples in zip(pending, results):
+                if samples is None:
+                    continue
+                logger.info(f"Generated voice: {text}")
+                voices[text] = samples
                 if cache:
-                    cache.set(cache_key, samples.copy())
+                    cache.set(AudioCache.generate_key("voice", text), samples)
 
-                return samples
-        finally:
-            # Clean up temp file
-            if os.path.exists(temp_wav):
-                try:
-                    os.remove(temp_wav)
-                except OSError:
-                    pass
+    for text in pending:
+        if text not in voices:
+            voices[text] = generate_voice_announcement(text, temp_dir, cache)
+    return {text: voices[text] for text in unique_texts}
 
-    except Exception as e:
-        logger.error(f"pyttsx3 error: {e}. Using silence instead.")
-        return generate_silence(AudioConstants.SILENCE_FALLBACK)
+
+# Interpolation tables per (original_rate, target_rate): source index and
+# weight for each output sample, grown to the longest clip seen so far
+_RESAMPLE_TABLES: Dict[Tuple[int, int], Tuple[np.ndarray, np.ndarray]] = {}
+
+
+def _resample_table(
+    original_rate: int,
+    target_rate: int,
+    new_length: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Get the interpolation indices and weights for a rate pair.
+
+    The positions only depend on the rate ratio, so a table built for a
+    longer clip is reused for every shorter one.
+
+    Args:
+        original_rate: Original sample rate in Hz
+        target_rate: Target sample rate in Hz
+        new_length: Number of output samples needed
+
+    Returns:
+        Tuple of (source index, weight) arrays of at least new_length entries
+    """
+    key = (original_rate, target_rate)
+    table = _RESAMPLE_TABLES.get(key)
+    if table is None or len(table[0]) < new_length:
+        ratio = target_rate / original_rate
+        original_index = np.arange(new_length) / ratio
+        index_floor = original_index.astype(np.intp)
+        weight = original_index - index_floor
+        index_floor.setflags(write=False)
+        weight.setflags(write=False)
+        table = (index_floor, weight)
+        _RESAMPLE_TABLES[key] = table
+    return table
 
 
 def resample_audio(
-    samples: List[int],
+    samples: np.ndarray,
     original_rate: int,
     target_rate: int
-) -> List[int]:
+) -> np.ndarray:
     """
     Simple audio resampling using linear interpolation.
 
@@ -322,29 +570,48 @@ def resample_audio(
 
     ratio = target_rate / original_rate
     new_length = int(len(samples) * ratio)
+    if new_length == 0:
+        return np.zeros(0, dtype=np.int16)
 
-    resampled = []
-    for i in range(new_length):
-        original_index = i / ratio
-        # Simple linear interpolation
-        index_floor = int(original_index)
-        index_ceil = min(index_floor + 1, len(samples) - 1)
+    # Simple linear interpolation between neighbouring source samples
+    index_floor, weight = _resample_table(
+        original_rate, target_rate, new_length
+    )
+    index_floor = index_floor[:new_length]
+    weight = weight[:new_length]
+    index_ceil = np.minimum(index_floor + 1, len(samples) - 1)
 
-        if index_floor == index_ceil:
-            resampled.append(samples[index_floor])
-        else:
-            weight = original_index - index_floor
-            interpolated = int(
-                samples[index_floor] * (1 - weight) +
-                samples[index_ceil] * weight
-            )
-            resampled.append(interpolated)
+    lower = samples[index_floor].astype(np.float64)
+    upper = samples[index_ceil].astype(np.float64)
+    interpolated = lower * (1 - weight) + upper * weight
+    # The last source sample has no right-hand neighbour; keep it as is
+    interpolated = np.where(index_floor == index_ceil, lower, interpolated)
 
-    return resampled
+    return interpolated.astype(np.int16)
+
+
+def _to_wav_frames(samples: np.ndarray) -> bytes:
+    """
+    Convert samples to 16-bit little-endian WAV frames.
+
+    Args:
+        samples: Audio samples to convert
+
+    Returns:
+        Raw frame bytes
+    """
+    # Ensure all samples are within 16-bit range; int16 input
+    # already is, so it is converted without an extra clipping copy
+    samples = np.asarray(samples)
+    if samples.dtype != np.int16:
+        samples = np.clip(
+            samples, SampleLimits.MIN_SAMPLE, SampleLimits.MAX_SAMPLE
+        )
+    return samples.astype('<i2', copy=False).tobytes()
 
 
 def write_wav_file(
-    samples: List[int],
+    samples: np.ndarray,
     filename: str,
     sample_rate: int = AudioConstants.SAMPLE_RATE
 ) -> None:
@@ -365,31 +632,62 @@ def write_wav_file(
             wav_file.setsampwidth(2)  # 16-bit
             wav_file.setframerate(sample_rate)
 
-            # Ensure all samples are within 16-bit range
-            clipped_samples = []
-            for sample in samples:
-                if sample > SampleLimits.MAX_SAMPLE:
-                    clipped_samples.append(SampleLimits.MAX_SAMPLE)
-                elif sample < SampleLimits.MIN_SAMPLE:
-                    clipped_samples.append(SampleLimits.MIN_SAMPLE)
-                else:
-                    clipped_samples.append(sample)
-
-            # Convert to bytes and write
-            fmt = '<' + 'h' * len(clipped_samples)
-            frames = struct.pack(fmt, *clipped_samples)
-            wav_file.writeframes(frames)
+            wav_file.writeframes(_to_wav_frames(samples))
     except Exception as e:
         raise AudioGenerationError(f"Failed to write WAV file: {e}")
 
 
-def create_audio_timeline(
+def write_wav_placements(
+    placements: List[Tuple[int, np.ndarray]],
+    num_samples: int,
+    filename: str,
+    sample_rate: int = AudioConstants.SAMPLE_RATE
+) -> None:
+    """
+    Stream a laid-out timeline to a WAV file without building it in memory.
+
+    Args:
+        placements: (start sample, samples) pairs in increasing,
+            non-overlapping order
+        num_samples: Total length of the timeline in samples
+        filename: Output filename
+        sample_rate: Sample rate in Hz
+
+    Raises:
+        AudioGenerationError: If file writing fails
+    """
+    # One second of silence, reused for every gap between placements
+    silence = _to_wav_frames(generate_silence(1.0, sample_rate))
+
+    def write_silence(wav_file: wave.Wave_write, count: int) -> None:
+        while count > 0:
+            step = min(count, sample_rate)
+            wav_file.writeframesraw(silence[:2 * step])
+            count -= step
+
+    try:
+        with wave.open(filename, 'wb') as wav_file:
+            wav_file.setnchannels(1)  # Mono
+            wav_file.setsampwidth(2)  # 16-bit
+            wav_file.setframerate(sample_rate)
+
+            position = 0
+            for start, samples in placements:
+                write_silence(wav_file, start - position)
+                wav_file.writeframesraw(_to_wav_frames(samples))
+                position = start + len(samples)
+            write_silence(wav_file, num_samples - position)
+    except Exception as e:
+        raise AudioGenerationError(f"Failed to write WAV file: {e}")
+
+
+def layout_audio_timeline(
     intervals: List,
     temp_dir: str,
     cache: Optional[AudioCache] = None
-) -> List[int]:
+) -> Tuple[List[Tuple[int, np.ndarray]], int]:
     """
-    Create audio timeline with beeps and voice announcements.
+    Lay out the beeps and voice announcements of the timeline.
 
     Args:
         intervals: List of interval parameters
@@ -397,45 +695,59 @@ def create_audio_timeline(
         cache: Optional AudioCache instance for caching
 
     Returns:
-        List of audio samples for complete timeline
+        Tuple of (start sample, samples) placements in timeline order and
+        the total length of the timeline in samples
     """
     logger.info("Creating audio timeline...")
-    audio_samples = []
+    # Generate every distinct sample up front; the beeps are built in
+    # worker threads while the announcements are prefetched here
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        beep_future = executor.submit(generate_beep, cache=cache)
+        triple_beep_future = executor.submit(generate_triple_beep, cache=cache)
+        voices = prefetch_voice_announcements(
+            announcement_texts(intervals), temp_dir, cache
+        )
+        beep = beep_future.result()
+        triple_beep = triple_beep_future.result()
+
+    # Lay out the timeline as (start sample, samples) placements; silence is
+    # just the gap between placements and is never materialized
+    placements: List[Tuple[int, np.ndarray]] = []
+    num_samples = 0
+
+    def append(samples: np.ndarray) -> None:
+        nonlocal num_samples
+        placements.append((num_samples, samples))
+        num_samples += len(samples)
+
+    def skip_silence(duration: float) -> None:
+        nonlocal num_samples
+        num_samples += int(duration * AudioConstants.SAMPLE_RATE)
 
     # Add starting test announcement with countdown
     logger.info("Adding 'starting test in 5 seconds' announcement")
-    starting_announcement = "Starting... test in 5 seconds"
-    starting_voice_samples = generate_voice_announcement(
-        starting_announcement, temp_dir, cache
-    )
-    audio_samples.extend(starting_voice_samples)
+    starting_voice_samples = voices[AudioConstants.STARTING_ANNOUNCEMENT]
+    append(starting_voice_samples)
 
     # Add countdown: 4, 3, 2, 1
-    countdown_numbers = [4, 3, 2, 1]
-    for i, countdown_num in enumerate(countdown_numbers):
+    for countdown_num in AudioConstants.COUNTDOWN_NUMBERS:
         # Add pause before each countdown number
-        audio_samples.extend(
-            generate_silence(AudioConstants.COUNTDOWN_NUMBER_PAUSE)
-        )
+        skip_silence(AudioConstants.COUNTDOWN_NUMBER_PAUSE)
         # Add voice for countdown number
         logger.info(f"Adding countdown: {countdown_num}")
-        countdown_voice = generate_voice_announcement(
-            str(countdown_num), temp_dir, cache
-        )
-        audio_samples.extend(countdown_voice)
+        countdown_voice = voices[str(countdown_num)]
+        append(countdown_voice)
 
     # Add a short pause before final beep (same duration as between numbers)
-    audio_samples.extend(
-        generate_silence(AudioConstants.COUNTDOWN_NUMBER_PAUSE)
-    )
+    skip_silence(AudioConstants.COUNTDOWN_NUMBER_PAUSE)
 
     # Add final beep to signal start (time zero reference point)
     logger.info("Adding start signal beep (time zero reference)")
-    audio_samples.extend(generate_beep(cache=cache))
+    append(beep)
 
     # Track the duration including announcement, countdown, and start beep
     # This is the offset - all interval times are relative to the final beep
-    starting_offset = len(audio_samples) / AudioConstants.SAMPLE_RATE
+    starting_offset = num_samples / AudioConstants.SAMPLE_RATE
 
     for i, interval in enumerate(intervals):
         # Calculate the time until this interval ends
@@ -457,7 +769,7 @@ def create_audio_timeline(
             if voice_time > starting_offset:
                 # Calculate current audio duration
                 current_audio_duration = (
-                    len(audio_samples) / AudioConstants.SAMPLE_RATE
+                    num_samples / AudioConstants.SAMPLE_RATE
                 )
 
                 # Add silence until voice announcement time
@@ -465,30 +777,24 @@ def create_audio_timeline(
                     voice_time - current_audio_duration
                 )
                 if silence_duration > 0:
-                    audio_samples.extend(
-                        generate_silence(silence_duration)
-                    )
+                    skip_silence(silence_duration)
 
                 # Add voice announcement for the NEXT interval's speed
-                speed_value = next_interval.speed_in_km_per_hour
-                announcement_text = (
-                    f"Next speed... {speed_value:.1f}... "
-                    f"kilometers per hour"
+                announcement_text = speed_announcement_text(
+                    next_interval.speed_in_km_per_hour
                 )
                 logger.info(
                     f"Adding voice announcement at "
                     f"{voice_time:.1f}s: {announcement_text}"
                 )
-                voice_samples = generate_voice_announcement(
-                    announcement_text, temp_dir, cache
-                )
-                audio_samples.extend(voice_samples)
+                voice_samples = voices[announcement_text]
+                append(voice_samples)
 
         # Add silence until interval end time
-        current_audio_duration = len(audio_samples) / AudioConstants.SAMPLE_RATE
+        current_audio_duration = num_samples / AudioConstants.SAMPLE_RATE
         silence_duration = interval_end_time - current_audio_duration
         if silence_duration > 0:
-            audio_samples.extend(generate_silence(silence_duration))
+            skip_silence(silence_duration)
 
         # Add beep at interval end
         if interval.move_to_next_stage_at_end:
@@ -498,12 +804,42 @@ def create_audio_timeline(
                 f"Adding triple beep at {end_time:.1f}s "
                 f"(speed change)"
             )
-            audio_samples.extend(generate_triple_beep(cache=cache))
+            append(triple_beep)
         else:
             # Single beep for normal interval end
             end_time = interval.total_duration_at_end_in_sec
             logger.info(f"Adding single beep at {end_time:.1f}s")
-            audio_samples.extend(generate_beep(cache=cache))
+            append(beep)
+
+    return placements, num_samples
+
+
+def create_audio_timeline(
+    intervals: List,
+    temp_dir: str,
+    cache: Optional[AudioCache] = None
+) -> np.ndarray:
+    """
+    Create audio timeline with beeps and voice announcements.
+
+    Assembles the placements from layout_audio_timeline into one buffer.
+    generate_audio_file streams them to disk instead; use this when the
+    samples themselves are needed.
+
+    Args:
+        intervals: List of interval parameters
+        temp_dir: Temporary directory for intermediate files
+        cache: Optional AudioCache instance for caching
+
+    Returns:
+        Array of int16 audio samples for complete timeline
+    """
+    placements, num_samples = layout_audio_timeline(intervals, temp_dir, cache)
+
+    # Allocate the whole timeline once and copy each placement into it
+    audio_samples = np.zeros(num_samples, dtype=np.int16)
+    for start, samples in placements:
+        audio_samples[start:start + len(samples)] = samples
 
     return audio_samples
 
@@ -532,18 +868,18 @@ def generate_audio_file(
     # Create cache if enabled
     cache = None
     if config and config.enable_cache:
-        cache = AudioCache(config.cache_dir)
+        cache = AudioCache.shared(config.cache_dir)
         logger.info(f"Cache enabled: {cache.size()} items")
 
     with tempfile.TemporaryDirectory() as temp_dir:
-        audio_samples = create_audio_timeline(
+        placements, num_samples = layout_audio_timeline(
             intervals, temp_dir, cache
         )
 
     logger.info(f"Exporting audio to {filename}...")
-    write_wav_file(audio_samples, filename)
+    write_wav_placements(placements, num_samples, filename)
 
-    duration = len(audio_samples) / AudioConstants.SAMPLE_RATE
+    duration = num_samples / AudioConstants.SAMPLE_RATE
     logger.info(f"Audio file generated: {filename}")
     logger.info(f"Total duration: {duration:.1f} seconds")
 
@@ -4,72 +4,131 @@ Provides efficient caching of generated audio samples.
 """
 
 import os
-import pickle
 import hashlib
 import logging
-from typing import Dict, List, Optional
+import threading
+from collections import OrderedDict
+from typing import ClassVar, Dict, Optional, Set
 from pathlib import Path
 
+import numpy as np
+
+from constants import CacheConstants
+
 logger = logging.getLogger(__name__)
 
 
 class AudioCache:
-    """Manages caching of generated audio samples."""
-
-    def __init__(self, cache_dir: str, enabled: bool = True):
+    """Manages caching of generated audio samples.
+
+    Each entry is persisted as its own ``.npy`` file in the cache directory,
+    and a bounded number of recently used entries are kept in memory.
+    Instances are safe to share between threads; use ``shared()`` to get
+    the application-wide instance for a directory.
+    """
+
+    _shared: ClassVar[Dict[str, "AudioCache"]] = {}
+    _shared_lock: ClassVar[threading.Lock] = threading.Lock()
+
+    def __init__(
+        self,
+        cache_dir: str,
+        enabled: bool = True,
+        max_memory_entries: int = CacheConstants.MAX_MEMORY_ENTRIES
+    ):
         """
         Initialize audio cache.
 
         Args:
             cache_dir: Directory path for cache storage.
             enabled: Whether caching is enabled.
+            max_memory_entries: Number of entries kept in memory.
         """
         self.cache_dir = cache_dir
         self.enabled = enabled
-        self._cache: Dict[str, List[int]] = {}
-        self._loaded = False
+        self.max_memory_entries = max_memory_entries
+        self._cache: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._disk_keys: Optional[Set[str]] = None
+        self._lock = threading.RLock()
 
-    def _get_cache_file_path(self) -> str:
-        """Get the path to the cache file."""
-        return os.path.join(self.cache_dir, "audio_cache.pkl")
+    @classmethod
+    def shared(cls, cache_dir: str) -> "AudioCache":
+        """
+        Get the shared cache instance for a directory.
+
+        Args:
+            cache_dir: Directory path for cache storage.
+
+        Returns:
+            The instance for cache_dir, created on first use.
+        """
+        key = os.path.abspath(cache_dir)
+        with cls._shared_lock:
+            cache = cls._shared.get(key)
+            if cache is None:
+                cache = cls(cache_dir)
+                cls._shared[key] = cache
+            return cache
+
+    def _get_entry_path(self, key: str) -> str:
+        """Get the path to the file holding a cache entry."""
+        return os.path.join(
+            self.cache_dir, key + CacheConstants.CACHE_FILE_SUFFIX
+        )
 
     def _ensure_cache_dir(self) -> None:
         """Ensure cache directory exists."""
         if self.enabled:
             Path(self.cache_dir).mkdir(parents=True, exist_ok=True)
 
-    def _load(self) -> None:
-        """Load cached audio samples from disk."""
-        if self._loaded or not self.enabled:
-            return
-
-        self._ensure_cache_dir()
-        cache_file = self._get_cache_file_path()
-
-        if os.path.exists(cache_file):
-            try:
-                with open(cache_file, 'rb') as f:
-                    self._cache = pickle.load(f)
-                logger.info(f"Loaded {len(self._cache)} cached audio samples")
-            except Exception as e:
-                logger.warning(f"Could not load audio cache: {e}")
-                self._cache = {}
-
-        self._loaded = True
+    def _remember(self, key: str, samples: np.ndarray) -> None:
+        """Keep an entry in memory, evicting the least recently used."""
+        self._cache[key] = samples
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.max_memory_entries:
+            self._cache.popitem(last=False)
+
+    def _load_index(self) -> Set[str]:
+        """List the keys stored on disk, scanning the directory only once."""
+        if self._disk_keys is None:
+            suffix = CacheConstants.CACHE_FILE_SUFFIX
+            names = (os.listdir(self.cache_dir)
+                     if os.path.isdir(self.cache_dir) else [])
+            self._disk_keys = {
+                name[:-len(suffix)] for name in names if name.endswith(suffix)
+            }
+        return self._disk_keys
+
+    def _load(self, key: str) -> Optional[np.ndarray]:
+        """Load a cache entry from disk."""
+        if key not in self._load_index():
+            return None
+        entry_file = self._get_entry_path(key)
 
-    def _save(self) -> None:
-        """Save cached audio samples to disk."""
-        if not self.enabled:
-            return
+        try:
+            # Read fully rather than memory-mapped: a live mapping keeps the
+            # file open, so os.replace and os.remove fail on Windows
+            samples = np.load(entry_file)
+            samples.setflags(write=False)
+            return samples
+        except Exception as e:
+            logger.warning(f"Could not load cached audio {key}: {e}")
+            return None
 
+    def _save(self, key: str, samples: np.ndarray) -> None:
+        """Save a cache entry to disk."""
         self._ensure_cache_dir()
-        cache_file = self._get_cache_file_path()
+        entry_file = self._get_entry_path(key)
+        temp_file = f"{entry_file}.tmp"
 
         try:
-            with open(cache_file, 'wb') as f:
-                pickle.dump(self._cache, f)
+            # Write to a side file first so readers never see a partial entry
+            with open(temp_file, 'wb') as f:
+                np.save(f, samples)
+            os.replace(temp_file, entry_file)
+            self._load_index().add(key)
         except Exception as e:
-            logger.warning(f"Could not save audio cache: {e}")
+            logger.warning(f"Could not save cached audio {key}: {e}")
 
     @staticmethod
     def generate_key(prefix: str, *args) -> str:
@@ -81,12 +140,13 @@ class AudioCache:
             *args: Additional arguments to include in key.
 
         Returns:
-            MD5 hash of the key components.
+            128-bit BLAKE2b hash of the key components.
         """
-        key_str = f"{prefix}:" + ":".join(str(arg) for arg in args)
-        return hashlib.md5(key_str.encode()).hexdigest()
+        key_str = (f"{CacheConstants.KEY_VERSION}:{prefix}:" +
+                   ":".join(str(arg) for arg in args))
+        return hashlib.blake2b(key_str.encode(), digest_size=16).hexdigest()
 
-    def get(self, key: str) -> Optional[List[int]]:
+    def get(self, key: str) -> Optional[np.ndarray]:
         """
         Retrieve cached audio samples.
 
@@ -94,20 +154,27 @@ class AudioCache:
             key: Cache key.
 
         Returns:
-            Copy of cached samples or None if not found.
+            Cached samples or None if not found. The array is read-only
+            and shared with the cache, so callers must not modify it.
         """
         if not self.enabled:
             return None
 
-        self._load()
-        if key in self._cache:
-            return self._cache[key].copy()
-        return None
+        with self._lock:
+            samples = self._cache.get(key)
+            if samples is None:
+                samples = self._load(key)
+                if samples is None:
+                    return None
+            self._remember(key, samples)
+            return samples
 
-    def set(self, key: str, samples: List[int]) -> None:
+    def set(self, key: str, samples: np.ndarray) -> None:
         """
         Cache audio samples.
 
+        The array is stored without copying and marked read-only.
+
         Args:
             key: Cache key.
             samples: Audio samples to cache.
@@ -115,22 +182,26 @@ class AudioCache:
         if not self.enabled:
             return
 
-        self._load()
-        self._cache[key] = samples.copy()
-        self._save()
+        with self._lock:
+            samples.setflags(write=False)
+            self._remember(key, samples)
+            self._save(key, samples)
 
     def clear(self) -> None:
         """Clear all cached samples."""
-        self._cache = {}
-        cache_file = self._get_cache_file_path()
-        if os.path.exists(cache_file):
+        with self._lock:
+            self._cache = OrderedDict()
             try:
-                os.remove(cache_file)
+                for key in sorted(self._load_index()):
+                    os.remove(self._get_entry_path(key))
+                    self._disk_keys.discard(key)
                 logger.info("Cache cleared")
             except Exception as e:
                 logger.warning(f"Could not clear cache: {e}")
 
     def size(self) -> int:
         """Get number of cached items."""
-        self._load()
-        return len(self._cache)
+        if not self.enabled:
+            return 0
+        with self._lock:
+            return len(self._load_index())
@@ -2,6 +2,8 @@
 Configuration and data classes for MAS Training Audio Generator.
 """
 
+import functools
+import math
 import os
 import logging
 from dataclasses import dataclass
@@ -33,7 +35,7 @@ def get_cache_directory():
     return str(cache_path)
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class TestConfig:
     """
     Configuration parameters for training test generation.
@@ -51,6 +53,7 @@ class TestConfig:
     max_speed: float
     enable_cache: bool
     cache_dir: str
+    max_iterations: int
 
     def __init__(
         self,
@@ -61,7 +64,8 @@ class TestConfig:
         stage_speed_increment: float,
         max_speed: float,
         enable_cache: bool = True,
-        cache_dir: Optional[str] = None
+        cache_dir: Optional[str] = None,
+        max_iterations: int = 100
     ):
         """
         Initialize training configuration with validation.
@@ -75,6 +79,7 @@ class TestConfig:
             max_speed: Maximum training speed in km/h.
             enable_cache: Whether to enable audio caching.
             cache_dir: Directory for cache storage (defaults to .cache).
+            max_iterations: Maximum number of intervals to generate.
 
         Raises:
             ConfigurationError: If configuration values are invalid.
@@ -89,6 +94,9 @@ class TestConfig:
                                 stage_duration_threshold_in_sec)
         self._validate_positive("stage_speed_increment", stage_speed_increment)
         self._validate_positive("max_speed", max_speed)
+        self._validate_positive("max_iterations", max_iterations)
+        self._validate_whole("interval_distance_in_meters",
+                             interval_distance_in_meters)
 
         if max_speed < init_speed_in_km_per_hour:
             raise ConfigurationError(
@@ -96,18 +104,23 @@ class TestConfig:
                 f"init_speed ({init_speed_in_km_per_hour})"
             )
 
-        # Set values
-        self.init_speed_in_km_per_hour = init_speed_in_km_per_hour
-        self.interval_distance_in_meters = interval_distance_in_meters
-        self.stage_duration_in_sec = stage_duration_in_sec
-        self.stage_duration_threshold_in_sec = stage_duration_threshold_in_sec
-        self.stage_speed_increment = stage_speed_increment
-        self.max_speed = max_speed
-        self.enable_cache = enable_cache
-        self.cache_dir = cache_dir if cache_dir else DEFAULT_CACHE_DIR
+        # Set values; the instance is frozen, so bypass __setattr__
+        set_field = functools.partial(object.__setattr__, self)
+        set_field('init_speed_in_km_per_hour', init_speed_in_km_per_hour)
+        set_field('interval_distance_in_meters',
+                  int(interval_distance_in_meters))
+        set_field('stage_duration_in_sec', stage_duration_in_sec)
+        set_field('stage_duration_threshold_in_sec',
+                  stage_duration_threshold_in_sec)
+        set_field('stage_speed_increment', stage_speed_increment)
+        set_field('max_speed', max_speed)
+        set_field('enable_cache', enable_cache)
+        set_field('cache_dir', cache_dir if cache_dir else DEFAULT_CACHE_DIR)
+        set_field('max_iterations', max_iterations)
 
         # Derived values
-        self.init_speed_in_meters_per_sec = init_speed_in_km_per_hour / 3.6
+        set_field('init_speed_in_meters_per_sec',
+                  init_speed_in_km_per_hour / 3.6)
 
         logger.debug(f"Configuration created: {self}")
 
@@ -116,3 +129,11 @@ class TestConfig:
         """Validate that a value is positive."""
         if value <= 0:
             raise ConfigurationError(f"{name} must be positive, got {value}")
+
+    @staticmethod
+    def _validate_whole(name: str, value: float) -> None:
+        """Validate that a value is a whole number."""
+        if not (math.isfinite(value) and float(value).is_integer()):
+            raise ConfigurationError(
+                f"{name} must be a whole number, got {value}"
+            )
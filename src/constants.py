@@ -18,6 +18,10 @@ class AudioConstants:
     SILENCE_FALLBACK = 2.0
     TTS_RATE = 150  # Speech rate
     TTS_VOLUME = 0.9  # Volume level (0.0 to 1.0)
+    ESPEAK_VOICE = "en+f3"  # Female variant, like the voice picked for pyttsx3
+    WAV_HEADER_SIZE = 44  # Canonical RIFF/WAVE header written by espeak-ng
+    STARTING_ANNOUNCEMENT = "Starting... test in 5 seconds"
+    COUNTDOWN_NUMBERS = (4, 3, 2, 1)
 
 
 class SampleLimits:
@@ -29,4 +33,6 @@ class SampleLimits:
 class CacheConstants:
     """Cache-related constants."""
     DEFAULT_CACHE_DIR = ".cache"
-    CACHE_FILE_NAME = "audio_cache.pkl"
+    CACHE_FILE_SUFFIX = ".npy"
+    MAX_MEMORY_ENTRIES = 64
+    KEY_VERSION = "v3"  # Bump when the key scheme or sample format changes
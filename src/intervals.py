@@ -3,9 +3,19 @@ Interval generation module for MAS Training Audio Generator.
 Handles calculation of training intervals and speed progressions.
 """
 
+import functools
 import logging
-from dataclasses import dataclass
-from typing import List
+import sys
+from dataclasses import dataclass, fields
+from typing import Iterator, Union
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional; the kernel then runs as plain Python
+    def njit(*args, **kwargs):
+        return lambda func: func
 
 from config import TestConfig
 from exceptions import IntervalGenerationError
@@ -13,34 +23,66 @@ from exceptions import IntervalGenerationError
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+@dataclass(slots=True)
 class IntervalParams:
     """Parameters for a single training interval."""
 
-    duration_in_sec: int
-    distance_in_meters: int
-    total_duration_at_start_in_sec: int
-    total_duration_at_end_in_sec: int
-    total_distance_at_start_in_meters: int
-    total_distance_at_end_in_meters: int
-    duration_time_in_stage_at_start: int
-    duration_time_in_stage_at_end: int
-    speed_in_meters_per_sec: float
-    speed_in_km_per_hour: float
-    move_to_next_stage_at_end: bool
-
-    def __init__(self):
-        self.duration_in_sec = 0
-        self.distance_in_meters = 0
-        self.total_duration_at_start_in_sec = 0
-        self.total_duration_at_end_in_sec = 0
-        self.total_distance_at_start_in_meters = 0
-        self.total_distance_at_end_in_meters = 0
-        self.speed_in_meters_per_sec = 0
-        self.speed_in_km_per_hour = 0
-        self.duration_time_in_stage_at_start = 0
-        self.duration_time_in_stage_at_end = 0
-        self.move_to_next_stage_at_end = False
+    duration_in_sec: int = 0
+    distance_in_meters: int = 0
+    total_duration_at_start_in_sec: int = 0
+    total_duration_at_end_in_sec: int = 0
+    total_distance_at_start_in_meters: int = 0
+    total_distance_at_end_in_meters: int = 0
+    duration_time_in_stage_at_start: int = 0
+    duration_time_in_stage_at_end: int = 0
+    speed_in_meters_per_sec: float = 0
+    speed_in_km_per_hour: float = 0
+    move_to_next_stage_at_end: bool = False
+
+
+@dataclass(eq=False, frozen=True)
+class IntervalSchedule:
+    """
+    All training intervals stored as parallel NumPy columns.
+
+    Each column is named after the matching IntervalParams field. Indexing
+    with an integer returns that interval as an IntervalParams and slicing
+    returns a sub-schedule, so code written against a list of intervals
+    keeps working. Schedules are frozen and compare by identity; compare
+    the columns with NumPy to check values.
+    """
+
+    duration_in_sec: np.ndarray
+    distance_in_meters: np.ndarray
+    total_duration_at_start_in_sec: np.ndarray
+    total_duration_at_end_in_sec: np.ndarray
+    total_distance_at_start_in_meters: np.ndarray
+    total_distance_at_end_in_meters: np.ndarray
+    duration_time_in_stage_at_start: np.ndarray
+    duration_time_in_stage_at_end: np.ndarray
+    speed_in_meters_per_sec: np.ndarray
+    speed_in_km_per_hour: np.ndarray
+    move_to_next_stage_at_end: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.duration_in_sec)
+
+    def __getitem__(
+        self, index: Union[int, slice]
+    ) -> Union[IntervalParams, "IntervalSchedule"]:
+        if isinstance(index, slice):
+            return IntervalSchedule(**{
+                field.name: getattr(self, field.name)[index]
+                for field in fields(self)
+            })
+        return IntervalParams(**{
+            field.name: getattr(self, field.name)[index].item()
+            for field in fields(self)
+        })
+
+    def __iter__(self) -> Iterator[IntervalParams]:
+        for index in range(len(self)):
+            yield self[index]
 
 
 def duration_from_speed_and_distance(
@@ -122,10 +164,9 @@ def create_next_interval(previous_interval: IntervalParams,
         ival.speed_in_km_per_hour = previous_interval.speed_in_km_per_hour
 
     ival.speed_in_meters_per_sec = ival.speed_in_km_per_hour / 3.6
-    ival.duration_in_sec = duration_from_speed_and_distance(
-        ival.speed_in_meters_per_sec,
-        config.interval_distance_in_meters
-    )
+    # Speeds are validated positive by TestConfig, so divide directly
+    ival.duration_in_sec = (config.interval_distance_in_meters /
+                            ival.speed_in_meters_per_sec)
     ival.total_duration_at_start_in_sec = previous_interval.total_duration_at_end_in_sec
     ival.total_duration_at_end_in_sec = (ival.total_duration_at_start_in_sec +
                                          ival.duration_in_sec)
@@ -154,115 +195,213 @@ def move_to_next_stage(current_interval: IntervalParams,
     Returns:
         True if should move to next stage, False otherwise
     """
-    stage_duration = current_interval.duration_time_in_stage_at_end
-    return (stage_duration > config.stage_duration_in_sec or
-            abs(stage_duration - config.stage_duration_in_sec) <
+    # Past the stage duration or within the threshold of it
+    return (current_interval.duration_time_in_stage_at_end >
+            config.stage_duration_in_sec -
             config.stage_duration_threshold_in_sec)
 
 
-def generate_intervals(config: TestConfig) -> List[IntervalParams]:
+@njit(cache=True)
+def _fill_intervals(init_speed_ms, distance, stage_duration, threshold,
+                    increment, max_speed, speed_ms, speed_kmh, duration,
+                    total_end, stage_start, stage_end, move):
+    """
+    Fill the interval columns and return the number of intervals.
+
+    Follows create_initial_interval and create_next_interval step by step,
+    so the values match the scalar functions exactly.
+    """
+    max_iterations = len(duration)
+    advance_after = stage_duration - threshold
+    # The previous interval is carried in locals rather than re-read
+    kmh = init_speed_ms * 3.6
+    interval_duration = distance / init_speed_ms
+    total = interval_duration
+    stage_time = interval_duration
+    moved = stage_time > advance_after
+    speed_ms[0] = init_speed_ms
+    speed_kmh[0] = kmh
+    duration[0] = interval_duration
+    total_end[0] = total
+    stage_start[0] = 0.0
+    stage_end[0] = stage_time
+    move[0] = moved
+
+    n = 1
+    while n < max_iterations and kmh <= max_speed:
+        if moved:
+            kmh = kmh + increment
+            stage_time = 0.0
+        stage_start[n] = stage_time
+        ms = kmh / 3.6
+        interval_duration = distance / ms
+        total = total + interval_duration
+        stage_time = stage_time + interval_duration
+        moved = stage_time > advance_after
+        speed_ms[n] = ms
+        speed_kmh[n] = kmh
+        duration[n] = interval_duration
+        total_end[n] = total
+        stage_end[n] = stage_time
+        move[n] = moved
+        n += 1
+    return n
+
+
+# Compile (or load the cached build) at import so the first schedule is fast
+_fill_intervals(1.0, 1, 1, 1, 1.0, 0.0,
+                *(np.empty(1) for _ in range(6)), np.empty(1, dtype=bool))
+
+
+def generate_intervals(config: TestConfig) -> IntervalSchedule:
     """
     Generate all training intervals based on configuration.
 
+    The numeric work runs in a kernel that is JIT-compiled when numba is
+    installed. Schedules are memoized on the training parameters, so the
+    returned schedule is frozen, its columns are read-only, and it is
+    shared between callers. A warning is logged when generation stops at
+    config.max_iterations rather than at max_speed.
+
     Args:
         config: Test configuration
 
     Returns:
-        List of interval parameters
-
-    Raises:
-        IntervalGenerationError: If maximum iterations reached
+        Schedule of all intervals
     """
     logger.info("Generating intervals...")
-    intervals = []
-
-    # Create initial interval
-    initial_interval = create_initial_interval(config)
-    intervals.append(initial_interval)
-
-    # Generate subsequent intervals
-    max_iterations = 100
-    ival = 1
-    next_interval = initial_interval
-
-    while ival < max_iterations and next_interval.speed_in_km_per_hour <= config.max_speed:
-        next_interval = create_next_interval(intervals[-1], config)
-        intervals.append(next_interval)
-        ival += 1
-
-    if ival >= max_iterations:
+    intervals = _generate_schedule(
+        config.init_speed_in_meters_per_sec,
+        config.interval_distance_in_meters,
+        config.stage_duration_in_sec,
+        config.stage_duration_threshold_in_sec,
+        config.stage_speed_increment,
+        config.max_speed,
+        config.max_iterations,
+    )
+    if len(intervals) >= config.max_iterations:
         logger.warning(
-            f"Maximum iterations ({max_iterations}) reached during interval generation"
+            f"Maximum iterations ({config.max_iterations}) reached during "
+            "interval generation"
         )
-
     logger.info(f"Generated {len(intervals)} intervals")
     return intervals
 
 
-def print_intervals_table(intervals: List[IntervalParams]) -> None:
+@functools.lru_cache(maxsize=32)
+def _generate_schedule(init_speed_ms: float, distance: int, stage_duration: int,
+                       threshold: int, increment: float, max_speed: float,
+                       max_iterations: int) -> IntervalSchedule:
+    """Compute the schedule for one set of training parameters."""
+    speed_ms, speed_kmh, duration, total_end, stage_start, stage_end = (
+        np.empty(max_iterations) for _ in range(6)
+    )
+    move = np.empty(max_iterations, dtype=bool)
+    num_intervals = _fill_intervals(
+        init_speed_ms, distance, stage_duration, threshold, increment,
+        max_speed, speed_ms, speed_kmh, duration, total_end, stage_start,
+        stage_end, move
+    )
+
+    total_end = total_end[:num_intervals]
+    intervals = IntervalSchedule(
+        duration_in_sec=duration[:num_intervals],
+        distance_in_meters=np.full(num_intervals, distance, dtype=np.int64),
+        total_duration_at_start_in_sec=np.concatenate(([0.0], total_end[:-1])),
+        total_duration_at_end_in_sec=total_end,
+        total_distance_at_start_in_meters=(
+            np.arange(num_intervals, dtype=np.int64) * distance
+        ),
+        total_distance_at_end_in_meters=(
+            np.arange(1, num_intervals + 1, dtype=np.int64) * distance
+        ),
+        duration_time_in_stage_at_start=stage_start[:num_intervals],
+        duration_time_in_stage_at_end=stage_end[:num_intervals],
+        speed_in_meters_per_sec=speed_ms[:num_intervals],
+        speed_in_km_per_hour=speed_kmh[:num_intervals],
+        move_to_next_stage_at_end=move[:num_intervals],
+    )
+    for field in fields(intervals):
+        getattr(intervals, field.name).setflags(write=False)
+    return intervals
+
+
+# Column widths of the interval table
+_COL_WIDTHS = {
+    'interval': 8,
+    'speed_kmh': 12,
+    'duration': 11,
+    'distance': 11,
+    'total_dur': 20,  # Increased for min:ss.sss format
+    'total_dist': 13,
+    'speed_ms': 11,
+    'change': 7,
+    'stage_time': 12
+}
+_TOTAL_WIDTH = sum(_COL_WIDTHS.values()) + len(_COL_WIDTHS) * 3 + 1
+
+_TOP_BORDER = "┌" + "─" * (_TOTAL_WIDTH - 2) + "┐"
+_HEADER_SEPARATOR = "├" + "─" * (_TOTAL_WIDTH - 2) + "┤"
+_STAGE_SEPARATOR = "├" + "┄" * (_TOTAL_WIDTH - 2) + "┤"
+_BOTTOM_BORDER = "└" + "─" * (_TOTAL_WIDTH - 2) + "┘"
+
+_TITLE = "INTERVAL TRAINING SCHEDULE"
+_TITLE_PADDING = (_TOTAL_WIDTH - len(_TITLE) - 2) // 2
+_TITLE_LINE = (
+    f"│{' ' * _TITLE_PADDING}{_TITLE}"
+    f"{' ' * (_TOTAL_WIDTH - len(_TITLE) - _TITLE_PADDING - 2)}│"
+)
+
+_HEADER = (
+    f"│ {'#':<{_COL_WIDTHS['interval']}} │ "
+    f"{'Speed':<{_COL_WIDTHS['speed_kmh']}} │ "
+    f"{'Duration':<{_COL_WIDTHS['duration']}} │ "
+    f"{'Distance':<{_COL_WIDTHS['distance']}} │ "
+    f"{'Total Time':<{_COL_WIDTHS['total_dur']}} │ "
+    f"{'Total Dist':<{_COL_WIDTHS['total_dist']}} │ "
+    f"{'Speed':<{_COL_WIDTHS['speed_ms']}} │ "
+    f"{'Change':<{_COL_WIDTHS['change']}} │ "
+    f"{'Stage':<{_COL_WIDTHS['stage_time']}} │"
+)
+
+# Subheader with units
+_SUBHEADER = (
+    f"│ {'':<{_COL_WIDTHS['interval']}} │ "
+    f"{'(km/h)':<{_COL_WIDTHS['speed_kmh']}} │ "
+    f"{'(s)':<{_COL_WIDTHS['duration']}} │ "
+    f"{'(m)':<{_COL_WIDTHS['distance']}} │ "
+    f"{'(min:ss.sss)':<{_COL_WIDTHS['total_dur']}} │ "
+    f"{'(m)':<{_COL_WIDTHS['total_dist']}} │ "
+    f"{'(m/s)':<{_COL_WIDTHS['speed_ms']}} │ "
+    f"{'?':<{_COL_WIDTHS['change']}} │ "
+    f"{'Time (s)':<{_COL_WIDTHS['stage_time']}} │"
+)
+
+_ROW_FORMAT = (
+    f"│ {{:<{_COL_WIDTHS['interval']}}} │ "
+    f"{{:<{_COL_WIDTHS['speed_kmh']}.2f}} │ "
+    f"{{:<{_COL_WIDTHS['duration']}.2f}} │ "
+    f"{{:<{_COL_WIDTHS['distance']}}} │ "
+    f"{{:<{_COL_WIDTHS['total_dur']}}} │ "
+    f"{{:<{_COL_WIDTHS['total_dist']}}} │ "
+    f"{{:<{_COL_WIDTHS['speed_ms']}.2f}} │ "
+    f"{{:^{_COL_WIDTHS['change']}}} │ "
+    f"{{:<{_COL_WIDTHS['stage_time']}.2f}} │"
+)
+
+
+def print_intervals_table(intervals: IntervalSchedule) -> None:
     """
     Print a formatted table of all intervals.
 
     Args:
-        intervals: List of interval parameters to display
+        intervals: Interval schedule to display
     """
-    # Define column widths
-    col_widths = {
-        'interval': 8,
-        'speed_kmh': 12,
-        'duration': 11,
-        'distance': 11,
-        'total_dur': 20,  # Increased for min:ss.sss format
-        'total_dist': 13,
-        'speed_ms': 11,
-        'change': 7,
-        'stage_time': 12
-    }
-
-    # Calculate total width
-    total_width = sum(col_widths.values()) + len(col_widths) * 3 + 1
-
-    # Top border
-    print("┌" + "─" * (total_width - 2) + "┐")
-
-    # Title
-    title = "INTERVAL TRAINING SCHEDULE"
-    padding = (total_width - len(title) - 2) // 2
-    print(f"│{' ' * padding}{title}{' ' * (total_width - len(title) - padding - 2)}│")
-
-    # Header separator
-    print("├" + "─" * (total_width - 2) + "┤")
-
-    # Header
-    header = (
-        f"│ {'#':<{col_widths['interval']}} │ "
-        f"{'Speed':<{col_widths['speed_kmh']}} │ "
-        f"{'Duration':<{col_widths['duration']}} │ "
-        f"{'Distance':<{col_widths['distance']}} │ "
-        f"{'Total Time':<{col_widths['total_dur']}} │ "
-        f"{'Total Dist':<{col_widths['total_dist']}} │ "
-        f"{'Speed':<{col_widths['speed_ms']}} │ "
-        f"{'Change':<{col_widths['change']}} │ "
-        f"{'Stage':<{col_widths['stage_time']}} │"
-    )
-    print(header)
-
-    # Subheader with units
-    subheader = (
-        f"│ {'':<{col_widths['interval']}} │ "
-        f"{'(km/h)':<{col_widths['speed_kmh']}} │ "
-        f"{'(s)':<{col_widths['duration']}} │ "
-        f"{'(m)':<{col_widths['distance']}} │ "
-        f"{'(min:ss.sss)':<{col_widths['total_dur']}} │ "
-        f"{'(m)':<{col_widths['total_dist']}} │ "
-        f"{'(m/s)':<{col_widths['speed_ms']}} │ "
-        f"{'?':<{col_widths['change']}} │ "
-        f"{'Time (s)':<{col_widths['stage_time']}} │"
-    )
-    print(subheader)
+    # Collect the table and write it to stdout in one call
+    lines = [_TOP_BORDER, _TITLE_LINE, _HEADER_SEPARATOR, _HEADER,
+             _SUBHEADER, _HEADER_SEPARATOR]
 
-    # Header separator
-    print("├" + "─" * (total_width - 2) + "┤")
+    row_format = _ROW_FORMAT.format
 
     # Intervals with alternating separators for speed changes
     for i, interval in enumerate(intervals):
@@ -275,29 +414,31 @@ def print_intervals_table(intervals: List[IntervalParams]) -> None:
         seconds = total_sec % 60
         time_formatted = f"{minutes}:{seconds:06.3f} ({total_sec:.2f}s)"
 
-        row = (
-            f"│ {i:<{col_widths['interval']}} │ "
-            f"{interval.speed_in_km_per_hour:<{col_widths['speed_kmh']}.2f} │ "
-            f"{interval.duration_in_sec:<{col_widths['duration']}.2f} │ "
-            f"{interval.distance_in_meters:<{col_widths['distance']}} │ "
-            f"{time_formatted:<{col_widths['total_dur']}} │ "
-            f"{interval.total_distance_at_end_in_meters:<{col_widths['total_dist']}} │ "
-            f"{interval.speed_in_meters_per_sec:<{col_widths['speed_ms']}.2f} │ "
-            f"{change_indicator:^{col_widths['change']}} │ "
-            f"{interval.duration_time_in_stage_at_end:<{col_widths['stage_time']}.2f} │"
-        )
-        print(row)
+        lines.append(row_format(
+            i,
+            interval.speed_in_km_per_hour,
+            interval.duration_in_sec,
+            interval.distance_in_meters,
+            time_formatted,
+            interval.total_distance_at_end_in_meters,
+            interval.speed_in_meters_per_sec,
+            change_indicator,
+            interval.duration_time_in_stage_at_end,
+        ))
 
         # Add visual separator for speed changes
         if interval.move_to_next_stage_at_end and i < len(intervals) - 1:
-            print("├" + "┄" * (total_width - 2) + "┤")
+            lines.append(_STAGE_SEPARATOR)
 
     # Bottom border
-    print("└" + "─" * (total_width - 2) + "┘")
+    lines.append(_BOTTOM_BORDER)
 
     # Summary
     total_duration = intervals[-1].total_duration_at_end_in_sec if intervals else 0
     total_distance = intervals[-1].total_distance_at_end_in_meters if intervals else 0
-    print(f"\n📊 Summary: {len(intervals)} intervals | "
-          f"Total time: {total_duration:.1f}s ({total_duration/60:.1f}min) | "
-          f"Total distance: {total_distance}m ({total_distance/1000:.2f}km)")
+    lines.append(
+        f"\n📊 Summary: {len(intervals)} intervals | "
+        f"Total time: {total_duration:.1f}s ({total_duration/60:.1f}min) | "
+        f"Total distance: {total_distance}m ({total_distance/1000:.2f}km)"
+    )
+    sys.stdout.write("\n".join(lines) + "\n")
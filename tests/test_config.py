@@ -0,0 +1,59 @@
+"""
+Unit tests for config module.
+"""
+
+import sys
+import unittest
+from pathlib import Path
+
+# Add src directory to path, once for the whole test run
+SRC_DIR = str(Path(__file__).parent.parent / 'src')
+if SRC_DIR not in sys.path:
+    sys.path.insert(0, SRC_DIR)
+
+from config import TestConfig  # noqa: E402
+from exceptions import ConfigurationError  # noqa: E402
+
+# Valid training parameters; tests override one at a time
+BASE_CONFIG_ARGS = dict(
+    init_speed_in_km_per_hour=10.0,
+    interval_distance_in_meters=50,
+    stage_duration_in_sec=60,
+    stage_duration_threshold_in_sec=5,
+    stage_speed_increment=0.5,
+    max_speed=20.0
+)
+
+
+class TestIntervalDistanceValidation(unittest.TestCase):
+    """Tests for interval distance validation."""
+
+    def test_whole_float_distance_is_stored_as_int(self):
+        """Test that a whole float distance is accepted as an integer."""
+        config = TestConfig(
+            **{**BASE_CONFIG_ARGS, 'interval_distance_in_meters': 50.0}
+        )
+
+        self.assertEqual(config.interval_distance_in_meters, 50)
+        self.assertIsInstance(config.interval_distance_in_meters, int)
+
+    def test_fractional_distance_is_rejected(self):
+        """Test that a fractional distance raises ConfigurationError."""
+        with self.assertRaisesRegex(ConfigurationError, "whole number"):
+            TestConfig(
+                **{**BASE_CONFIG_ARGS, 'interval_distance_in_meters': 50.5}
+            )
+
+    def test_non_finite_distance_is_rejected(self):
+        """Test that NaN and infinite distances raise ConfigurationError."""
+        for distance in (float('nan'), float('inf')):
+            with self.subTest(distance=distance):
+                with self.assertRaisesRegex(ConfigurationError, "whole number"):
+                    TestConfig(
+                        **{**BASE_CONFIG_ARGS,
+                           'interval_distance_in_meters': distance}
+                    )
+
+
+if __name__ == '__main__':
+    unittest.main()
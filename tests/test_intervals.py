@@ -4,10 +4,15 @@ Unit tests for intervals module.
 
 import sys
 import unittest
+from dataclasses import FrozenInstanceError, replace
 from pathlib import Path
 
-# Add src directory to path
-sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+import numpy as np
+
+# Add src directory to path, once for the whole test run
+SRC_DIR = str(Path(__file__).parent.parent / 'src')
+if SRC_DIR not in sys.path:
+    sys.path.insert(0, SRC_DIR)
 
 from config import TestConfig  # noqa: E402
 from intervals import (  # noqa: E402
@@ -19,36 +24,40 @@ from intervals import (  # noqa: E402
     generate_intervals
 )
 
+# Training parameters shared by most tests
+BASE_CONFIG_ARGS = dict(
+    init_speed_in_km_per_hour=10.0,
+    interval_distance_in_meters=50,
+    stage_duration_in_sec=60,
+    stage_duration_threshold_in_sec=5,
+    stage_speed_increment=0.5,
+    max_speed=20.0
+)
+BASE_CONFIG = TestConfig(**BASE_CONFIG_ARGS)
+
+
+def make_config(**overrides) -> TestConfig:
+    """Build a config from the shared parameters with some overridden."""
+    return TestConfig(**{**BASE_CONFIG_ARGS, **overrides})
+
 
 class TestDurationFromSpeedAndDistance(unittest.TestCase):
     """Tests for duration_from_speed_and_distance function."""
 
-    def test_normal_calculation(self):
-        """Test normal duration calculation."""
-        speed = 10.0  # m/s
-        distance = 100  # meters
-        expected_duration = 10.0  # seconds
-        result = duration_from_speed_and_distance(speed, distance)
-        self.assertEqual(result, expected_duration)
-
-    def test_with_decimal_values(self):
-        """Test with decimal values."""
-        speed = 2.5  # m/s
-        distance = 50  # meters
-        expected_duration = 20.0  # seconds
-        result = duration_from_speed_and_distance(speed, distance)
-        self.assertEqual(result, expected_duration)
-
-    def test_fractional_result(self):
-        """Test when result is fractional."""
-        speed = 3.0  # m/s
-        distance = 50  # meters
-        expected_duration = 16.666666666666668  # seconds
-        self.assertAlmostEqual(
-            duration_from_speed_and_distance(speed, distance),
-            expected_duration,
-            places=10
-        )
+    def test_duration_calculation(self):
+        """Test duration calculation for whole and fractional results."""
+        cases = [
+            # speed (m/s), distance (m), expected duration (s)
+            (10.0, 100, 10.0),
+            (2.5, 50, 20.0),
+            (3.0, 50, 16.666666666666668),
+        ]
+        for speed, distance, expected_duration in cases:
+            with self.subTest(speed=speed, distance=distance):
+                self.assertEqual(
+                    duration_from_speed_and_distance(speed, distance),
+                    expected_duration
+                )
 
 
 class TestIntervalParams(unittest.TestCase):
@@ -57,44 +66,42 @@ class TestIntervalParams(unittest.TestCase):
     def test_initialization(self):
         """Test IntervalParams initializes with zero values."""
         params = IntervalParams()
-        self.assertEqual(params.duration_in_sec, 0)
-        self.assertEqual(params.distance_in_meters, 0)
-        self.assertEqual(params.total_duration_at_start_in_sec, 0)
-        self.assertEqual(params.total_duration_at_end_in_sec, 0)
-        self.assertEqual(params.total_distance_at_start_in_meters, 0)
-        self.assertEqual(params.total_distance_at_end_in_meters, 0)
-        self.assertEqual(params.speed_in_meters_per_sec, 0)
-        self.assertEqual(params.speed_in_km_per_hour, 0)
-        self.assertEqual(params.duration_time_in_stage_at_start, 0)
-        self.assertEqual(params.duration_time_in_stage_at_end, 0)
-        self.assertFalse(params.move_to_next_stage_at_end)
+        expected = [
+            ('duration_in_sec', 0),
+            ('distance_in_meters', 0),
+            ('total_duration_at_start_in_sec', 0),
+            ('total_duration_at_end_in_sec', 0),
+            ('total_distance_at_start_in_meters', 0),
+            ('total_distance_at_end_in_meters', 0),
+            ('speed_in_meters_per_sec', 0),
+            ('speed_in_km_per_hour', 0),
+            ('duration_time_in_stage_at_start', 0),
+            ('duration_time_in_stage_at_end', 0),
+            ('move_to_next_stage_at_end', False),
+        ]
+        for name, value in expected:
+            with self.subTest(field=name):
+                self.assertEqual(getattr(params, name), value)
 
 
 class TestCreateInitialInterval(unittest.TestCase):
     """Tests for create_initial_interval function."""
 
+    @classmethod
+    def setUpClass(cls):
+        cls.config = BASE_CONFIG
+
     def test_basic_interval_creation(self):
         """Test creating initial interval with basic configuration."""
-        config = TestConfig(
-            init_speed_in_km_per_hour=10.0,
-            interval_distance_in_meters=50,
-            stage_duration_in_sec=60,
-            stage_duration_threshold_in_sec=5,
-            stage_speed_increment=0.5,
-            max_speed=20.0
-        )
+        config = self.config
 
         interval = create_initial_interval(config)
 
         # Verify basic properties
         self.assertEqual(interval.distance_in_meters, 50)
-        self.assertAlmostEqual(
-            interval.speed_in_km_per_hour, 10.0, places=2
-        )
+        self.assertEqual(interval.speed_in_km_per_hour, 10.0)
         expected_speed_mps = 10.0 / 3.6
-        self.assertAlmostEqual(
-            interval.speed_in_meters_per_sec, expected_speed_mps, places=2
-        )
+        self.assertEqual(interval.speed_in_meters_per_sec, expected_speed_mps)
 
         # Verify timing
         self.assertEqual(interval.total_duration_at_start_in_sec, 0)
@@ -107,99 +114,64 @@ class TestCreateInitialInterval(unittest.TestCase):
 
     def test_speed_conversion(self):
         """Test km/h to m/s conversion in initial interval."""
-        config = TestConfig(
+        config = make_config(
             init_speed_in_km_per_hour=36.0,  # 10 m/s
             interval_distance_in_meters=100,
-            stage_duration_in_sec=60,
-            stage_duration_threshold_in_sec=5,
-            stage_speed_increment=0.5,
             max_speed=40.0
         )
 
         interval = create_initial_interval(config)
 
-        self.assertAlmostEqual(
-            interval.speed_in_meters_per_sec, 10.0, places=2
-        )
-        self.assertAlmostEqual(interval.duration_in_sec, 10.0, places=2)
+        self.assertEqual(interval.speed_in_meters_per_sec, 10.0)
+        self.assertEqual(interval.duration_in_sec, 10.0)
 
 
 class TestMoveToNextStage(unittest.TestCase):
     """Tests for move_to_next_stage function."""
 
-    def test_move_when_exceeds_stage_duration(self):
-        """Test moving to next stage when duration exceeds threshold."""
-        config = TestConfig(
-            init_speed_in_km_per_hour=10.0,
-            interval_distance_in_meters=50,
-            stage_duration_in_sec=60,
-            stage_duration_threshold_in_sec=5,
-            stage_speed_increment=0.5,
-            max_speed=20.0
-        )
+    @classmethod
+    def setUpClass(cls):
+        cls.config = BASE_CONFIG
 
-        interval = IntervalParams()
-        interval.duration_time_in_stage_at_end = 65  # Exceeds 60
-
-        self.assertTrue(move_to_next_stage(interval, config))
-
-    def test_move_when_within_threshold(self):
-        """Test moving to next stage when within threshold."""
-        config = TestConfig(
-            init_speed_in_km_per_hour=10.0,
-            interval_distance_in_meters=50,
-            stage_duration_in_sec=60,
-            stage_duration_threshold_in_sec=5,
-            stage_speed_increment=0.5,
-            max_speed=20.0
-        )
+    def test_move_decision(self):
+        """Test stage changes above, within and below the threshold."""
+        cases = [
+            (65, True),   # Exceeds 60
+            (58, True),   # Within threshold
+            (50, False),  # Below threshold
+        ]
+        for stage_time, expected in cases:
+            with self.subTest(stage_time=stage_time):
+                interval = IntervalParams()
+                interval.duration_time_in_stage_at_end = stage_time
 
-        interval = IntervalParams()
-        interval.duration_time_in_stage_at_end = 58  # Within threshold
-
-        self.assertTrue(move_to_next_stage(interval, config))
-
-    def test_no_move_when_below_threshold(self):
-        """Test not moving when below threshold."""
-        config = TestConfig(
-            init_speed_in_km_per_hour=10.0,
-            interval_distance_in_meters=50,
-            stage_duration_in_sec=60,
-            stage_duration_threshold_in_sec=5,
-            stage_speed_increment=0.5,
-            max_speed=20.0
-        )
-
-        interval = IntervalParams()
-        interval.duration_time_in_stage_at_end = 50  # Below threshold
-
-        self.assertFalse(move_to_next_stage(interval, config))
+                self.assertEqual(
+                    move_to_next_stage(interval, self.config), expected
+                )
 
 
 class TestCreateNextInterval(unittest.TestCase):
     """Tests for create_next_interval function."""
 
+    @classmethod
+    def setUpClass(cls):
+        cls.config = BASE_CONFIG
+        cls.initial_interval = create_initial_interval(cls.config)
+
     def test_next_interval_same_speed(self):
         """Test creating next interval with same speed."""
-        config = TestConfig(
-            init_speed_in_km_per_hour=10.0,
-            interval_distance_in_meters=50,
-            stage_duration_in_sec=60,
-            stage_duration_threshold_in_sec=5,
-            stage_speed_increment=0.5,
-            max_speed=20.0
-        )
+        config = self.config
 
-        prev_interval = create_initial_interval(config)
-        prev_interval.move_to_next_stage_at_end = False
+        prev_interval = replace(
+            self.initial_interval, move_to_next_stage_at_end=False
+        )
 
         next_interval = create_next_interval(prev_interval, config)
 
         # Speed should remain the same
-        self.assertAlmostEqual(
+        self.assertEqual(
             next_interval.speed_in_km_per_hour,
-            prev_interval.speed_in_km_per_hour,
-            places=2
+            prev_interval.speed_in_km_per_hour
         )
 
         # Cumulative totals should increase
@@ -214,25 +186,18 @@ class TestCreateNextInterval(unittest.TestCase):
 
     def test_next_interval_increased_speed(self):
         """Test creating next interval with increased speed."""
-        config = TestConfig(
-            init_speed_in_km_per_hour=10.0,
-            interval_distance_in_meters=50,
-            stage_duration_in_sec=60,
-            stage_duration_threshold_in_sec=5,
-            stage_speed_increment=0.5,
-            max_speed=20.0
-        )
+        config = self.config
 
-        prev_interval = create_initial_interval(config)
-        prev_interval.move_to_next_stage_at_end = True
+        prev_interval = replace(
+            self.initial_interval, move_to_next_stage_at_end=True
+        )
 
         next_interval = create_next_interval(prev_interval, config)
 
         # Speed should increase
-        self.assertAlmostEqual(
+        self.assertEqual(
             next_interval.speed_in_km_per_hour,
-            prev_interval.speed_in_km_per_hour + 0.5,
-            places=2
+            prev_interval.speed_in_km_per_hour + 0.5
         )
 
         # Stage time should reset
@@ -243,16 +208,9 @@ class TestCreateNextInterval(unittest.TestCase):
 
     def test_cumulative_values(self):
         """Test that cumulative values are correctly calculated."""
-        config = TestConfig(
-            init_speed_in_km_per_hour=10.0,
-            interval_distance_in_meters=50,
-            stage_duration_in_sec=60,
-            stage_duration_threshold_in_sec=5,
-            stage_speed_increment=0.5,
-            max_speed=20.0
-        )
+        config = self.config
 
-        interval1 = create_initial_interval(config)
+        interval1 = self.initial_interval
         interval2 = create_next_interval(interval1, config)
 
         # Check cumulative distance
@@ -266,10 +224,9 @@ class TestCreateNextInterval(unittest.TestCase):
         )
 
         # Check cumulative duration
-        self.assertAlmostEqual(
+        self.assertEqual(
             interval2.total_duration_at_start_in_sec,
-            interval1.total_duration_at_end_in_sec,
-            places=2
+            interval1.total_duration_at_end_in_sec
         )
 
 
@@ -278,14 +235,7 @@ class TestGenerateIntervals(unittest.TestCase):
 
     def test_basic_interval_generation(self):
         """Test generating intervals with basic configuration."""
-        config = TestConfig(
-            init_speed_in_km_per_hour=8.0,
-            interval_distance_in_meters=50,
-            stage_duration_in_sec=60,
-            stage_duration_threshold_in_sec=5,
-            stage_speed_increment=0.5,
-            max_speed=10.0
-        )
+        config = make_config(init_speed_in_km_per_hour=8.0, max_speed=10.0)
 
         intervals = generate_intervals(config)
 
@@ -293,9 +243,7 @@ class TestGenerateIntervals(unittest.TestCase):
         self.assertGreater(len(intervals), 1)
 
         # First interval should have correct initial speed
-        self.assertAlmostEqual(
-            intervals[0].speed_in_km_per_hour, 8.0, places=2
-        )
+        self.assertEqual(intervals[0].speed_in_km_per_hour, 8.0)
 
         # Last interval may exceed max speed by one increment
         self.assertLessEqual(
@@ -305,89 +253,128 @@ class TestGenerateIntervals(unittest.TestCase):
 
     def test_speed_progression(self):
         """Test that speed increases correctly through stages."""
-        config = TestConfig(
-            init_speed_in_km_per_hour=8.0,
-            interval_distance_in_meters=50,
-            stage_duration_in_sec=60,
-            stage_duration_threshold_in_sec=5,
-            stage_speed_increment=0.5,
-            max_speed=10.0
-        )
+        config = make_config(init_speed_in_km_per_hour=8.0, max_speed=10.0)
 
         intervals = generate_intervals(config)
 
-        # Find where speed changes occur
-        speeds = [interval.speed_in_km_per_hour for interval in intervals]
-        unique_speeds = sorted(set(speeds))
-
-        # Verify speed increments
-        for i in range(1, len(unique_speeds)):
-            self.assertAlmostEqual(
-                unique_speeds[i] - unique_speeds[i-1],
-                0.5,
-                places=2
-            )
+        # Distinct stage speeds should step by 0.5 km/h from 8.0
+        unique_speeds = np.unique(intervals.speed_in_km_per_hour)
+        expected = [8.0 + 0.5 * i for i in range(len(unique_speeds))]
+        self.assertSequenceEqual(np.round(unique_speeds, 2).tolist(), expected)
 
     def test_max_speed_limit(self):
         """Test that generation stops at max speed."""
-        config = TestConfig(
+        config = make_config(init_speed_in_km_per_hour=8.0, max_speed=9.0)
+
+        intervals = generate_intervals(config)
+
+        # No interval should exceed max speed by more than one increment
+        self.assertLessEqual(
+            intervals.speed_in_km_per_hour.max(),
+            config.max_speed + config.stage_speed_increment
+        )
+
+    def test_max_iterations_limit(self):
+        """Test that generation stops after max_iterations intervals."""
+        config = make_config(
             init_speed_in_km_per_hour=8.0,
-            interval_distance_in_meters=50,
-            stage_duration_in_sec=60,
-            stage_duration_threshold_in_sec=5,
-            stage_speed_increment=0.5,
-            max_speed=9.0
+            max_speed=18.0,
+            max_iterations=10
         )
 
         intervals = generate_intervals(config)
 
-        # No interval should exceed max speed by more than one increment
-        for interval in intervals:
-            self.assertLessEqual(
-                interval.speed_in_km_per_hour,
-                config.max_speed + config.stage_speed_increment
-            )
+        self.assertEqual(len(intervals), 10)
+
+    def test_max_iterations_warning_on_every_call(self):
+        """Test that hitting max_iterations is reported for cached schedules too."""
+        config = make_config(
+            init_speed_in_km_per_hour=8.0,
+            max_speed=18.0,
+            max_iterations=12
+        )
+
+        for _ in range(2):
+            with self.assertLogs('intervals', level='WARNING'):
+                generate_intervals(config)
+
+    def test_matches_interval_chain(self):
+        """Test that the kernel reproduces the scalar recurrence exactly."""
+        cases = [
+            make_config(max_speed=12.0),
+            make_config(
+                init_speed_in_km_per_hour=8.0,
+                stage_duration_in_sec=20,
+                stage_duration_threshold_in_sec=3,
+                max_speed=10.0
+            ),
+            make_config(
+                init_speed_in_km_per_hour=6.0,
+                interval_distance_in_meters=20,
+                stage_duration_in_sec=20,
+                stage_duration_threshold_in_sec=1,
+                stage_speed_increment=0.25,
+                max_speed=9.0
+            ),
+            make_config(
+                init_speed_in_km_per_hour=8.0,
+                max_speed=18.0,
+                max_iterations=10
+            ),
+        ]
+        for config in cases:
+            with self.subTest(config=config):
+                expected = [create_initial_interval(config)]
+                while (len(expected) < config.max_iterations and
+                       expected[-1].speed_in_km_per_hour <= config.max_speed):
+                    expected.append(create_next_interval(expected[-1], config))
+
+                intervals = list(generate_intervals(config))
+
+                self.assertEqual(len(intervals), len(expected))
+                for interval, reference in zip(intervals, expected):
+                    self.assertEqual(interval, reference)
 
     def test_distance_accumulation(self):
         """Test that distances accumulate correctly."""
-        config = TestConfig(
-            init_speed_in_km_per_hour=10.0,
-            interval_distance_in_meters=50,
-            stage_duration_in_sec=60,
-            stage_duration_threshold_in_sec=5,
-            stage_speed_increment=0.5,
-            max_speed=12.0
-        )
+        config = make_config(max_speed=12.0)
 
         intervals = generate_intervals(config)
 
-        # Each interval should add exactly 50 meters
-        for i, interval in enumerate(intervals):
-            expected_distance = (i + 1) * 50
-            self.assertEqual(
-                interval.total_distance_at_end_in_meters,
-                expected_distance
-            )
+        # Each interval should add exactly 50 meters, in integer arithmetic
+        expected = np.arange(1, len(intervals) + 1, dtype=np.int64) * 50
+        np.testing.assert_array_equal(
+            intervals.total_distance_at_end_in_meters, expected, strict=True
+        )
 
     def test_duration_accumulation(self):
         """Test that durations accumulate correctly."""
-        config = TestConfig(
-            init_speed_in_km_per_hour=10.0,
-            interval_distance_in_meters=50,
-            stage_duration_in_sec=60,
-            stage_duration_threshold_in_sec=5,
-            stage_speed_increment=0.5,
-            max_speed=11.0
-        )
+        config = make_config(max_speed=11.0)
 
         intervals = generate_intervals(config)
 
         # Duration should be monotonically increasing
-        for i in range(1, len(intervals)):
-            self.assertGreater(
-                intervals[i].total_duration_at_end_in_sec,
-                intervals[i-1].total_duration_at_end_in_sec
-            )
+        self.assertTrue(
+            np.all(np.diff(intervals.total_duration_at_end_in_sec) > 0)
+        )
+
+    def test_repeated_config_reuses_schedule(self):
+        """Test that identical configurations share one read-only schedule."""
+        intervals = generate_intervals(make_config(max_speed=11.0))
+
+        self.assertIs(
+            generate_intervals(make_config(max_speed=11.0)), intervals
+        )
+        self.assertFalse(intervals.duration_in_sec.flags.writeable)
+        with self.assertRaises(FrozenInstanceError):
+            intervals.duration_in_sec = intervals.duration_in_sec.copy()
+
+    def test_schedules_compare_without_raising(self):
+        """Test that == on schedules with array columns returns a bool."""
+        intervals = generate_intervals(make_config(max_speed=11.0))
+
+        self.assertEqual(intervals, intervals)
+        self.assertIsInstance(intervals == intervals[:], bool)
 
 
 if __name__ == '__main__':
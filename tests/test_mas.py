@@ -0,0 +1,145 @@
+"""
+Unit tests for the standalone mas script.
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import numpy as np
+
+# Add the repository root to path, once for the whole test run
+ROOT_DIR = str(Path(__file__).parent.parent)
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+import mas  # noqa: E402
+from mas import (  # noqa: E402
+    TestConfig,
+    build_intervals,
+    create_init_interval,
+    create_next_interval,
+    intervals_from_table,
+)
+
+
+class TestBuildIntervals(unittest.TestCase):
+    """Tests for the build_intervals kernel."""
+
+    # The last stage lands exactly on max_speed (6.0 + 12 * 0.25 = 9.0)
+    CONFIG_ARGS = (6.0, 20, 20, 1, 0.25, 9.0)
+
+    def _kernel_intervals(self, config):
+        """Run build_intervals for config and wrap the rows."""
+        table = np.zeros((101, 8), dtype=np.float64)
+        count = build_intervals(
+            config.init_speed_in_meters_per_sec,
+            config.interval_distance_in_meters,
+            config.stage_duration_in_sec,
+            config.stage_duration_threshold_in_sec,
+            config.stage_speed_increment,
+            config.max_speed,
+            table,
+        )
+        return intervals_from_table(table[:count], config)
+
+    def test_stage_landing_on_max_speed(self):
+        """Test that the stage at exactly max_speed is still run."""
+        config = TestConfig(*self.CONFIG_ARGS)
+        intervals = self._kernel_intervals(config)
+
+        self.assertEqual(len(intervals), 33)
+        speeds = [interval.speed_in_km_per_hour for interval in intervals]
+        self.assertEqual(speeds.count(9.0), 3)
+        self.assertEqual(speeds[-1], 9.25)
+
+    def test_matches_interval_chain(self):
+        """Test that the kernel reproduces create_next_interval exactly."""
+        config = TestConfig(*self.CONFIG_ARGS)
+        expected = [create_init_interval(config)]
+        while (len(expected) < 101 and
+               expected[-1].speed_in_km_per_hour <= config.max_speed):
+            expected.append(create_next_interval(expected[-1], config))
+
+        intervals = self._kernel_intervals(config)
+
+        self.assertEqual(len(intervals), len(expected))
+        for interval, reference in zip(intervals, expected):
+            self.assertEqual(
+                interval.speed_in_km_per_hour, reference.speed_in_km_per_hour
+            )
+            self.assertEqual(
+                interval.total_duration_at_end_in_sec,
+                reference.total_duration_at_end_in_sec
+            )
+
+
+
+class TestVoiceCache(unittest.TestCase):
+    """Tests for the on-disk voice cache."""
+
+    def setUp(self):
+        """Point the cache at a fresh directory and empty the memory cache."""
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        self.cache_dir = os.path.join(tmpdir.name, "mas")
+        self.default_cache_dir = mas.CACHE_DIR
+        patcher = mock.patch.object(mas, 'CACHE_DIR', self.cache_dir)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = mock.patch.dict(mas._voice_cache, clear=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_truncated_entry_is_resynthesized(self):
+        """Test that a partial cache file is replaced instead of crashing."""
+        os.makedirs(self.cache_dir)
+        with open(mas._voice_cache_file("4"), 'wb') as f:
+            f.write(b'\x93NUMPY')
+        samples = np.arange(5, dtype=np.int16)
+
+        with mock.patch.object(mas, 'synthesize_voice_announcement',
+                               return_value=samples) as synthesize:
+            result = mas.generate_voice_announcement("4", "unused")
+
+        synthesize.assert_called_once()
+        self.assertEqual(result.tolist(), samples.tolist())
+        self.assertEqual(
+            np.load(mas._voice_cache_file("4")).tolist(), samples.tolist()
+        )
+        self.assertEqual(os.listdir(self.cache_dir),
+                         [os.path.basename(mas._voice_cache_file("4"))])
+
+    def test_entries_stay_out_of_the_shared_cache_directory(self):
+        """Test that mas.py keeps its entries below .cache, not in it."""
+        default_dir = Path(self.default_cache_dir)
+        self.assertEqual(default_dir.parent, Path(".cache"))
+        self.assertNotEqual(default_dir, Path(".cache"))
+
+
+
+class TestEspeakSynthesis(unittest.TestCase):
+    """Tests for in-memory espeak-ng synthesis."""
+
+    def test_uses_pyttsx3_voice_settings(self):
+        """Test that espeak-ng gets the female voice and pyttsx3 volume."""
+        header = bytearray(44)
+        header[24:28] = (44100).to_bytes(4, 'little')
+        result = mock.Mock(stdout=bytes(header) + b'\x01\x00\x02\x00')
+        with mock.patch.object(mas.shutil, 'which',
+                               return_value='/usr/bin/espeak-ng'), \
+                mock.patch.object(mas.subprocess, 'run',
+                                  return_value=result) as run:
+            samples = mas.synthesize_with_espeak("4")
+
+        command = run.call_args[0][0]
+        self.assertEqual(command[command.index('-v') + 1], mas.ESPEAK_VOICE)
+        self.assertEqual(command[command.index('-a') + 1], '90')
+        self.assertEqual(samples.tolist(), [1, 2])
+
+
+if __name__ == '__main__':
+    unittest.main()